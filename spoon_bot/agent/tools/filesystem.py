@@ -5,7 +5,10 @@ All tools enforce workspace boundary security to prevent path traversal attacks.
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import os
+import stat
 from pathlib import Path
 from typing import Any
 
@@ -21,7 +24,7 @@ from spoon_bot.agent.tools.execution_context import (
     suppress_redundant_file_read,
 )
 from spoon_bot.agent.tools.path_validator import (
-    PathValidator,
+    _get_validator,
     set_default_validator,
     validate_directory_path,
     validate_read_path,
@@ -29,6 +32,34 @@ from spoon_bot.agent.tools.path_validator import (
 )
 
 
+# Refuse a symlink as the final path component when opening for read.
+# Not available on Windows, where the validator's checks stand alone.
+_O_NOFOLLOW = getattr(os, "O_NOFOLLOW", 0)
+
+
+def _read_file_bytes(path: str) -> bytes:
+    """Read a whole file with one open, one fstat-sized read and one close.
+
+    ``path`` is the validator's fully resolved path, so it never names a
+    symlink; O_NOFOLLOW makes the open fail if one was swapped in after
+    validation instead of following it out of the workspace.
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0) | _O_NOFOLLOW)
+    with open(fd, "rb") as f:
+        return f.read()
+
+
+def _decode_text(data: bytes, encoding: str) -> str:
+    """Decode like text-mode ``open``: fall back to latin-1, universal newlines."""
+    try:
+        text = data.decode(encoding)
+    except UnicodeDecodeError:
+        text = data.decode("latin-1")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
 class ReadFileTool(Tool):
     """Tool to read file contents with encoding fallback and path traversal protection."""
 
@@ -39,20 +70,17 @@ class ReadFileTool(Tool):
         max_output: int = 6000,
     ):
         self._workspace = Path(workspace).resolve() if workspace else None
-        self._additional_read_paths = additional_read_paths
+        self._additional_read_paths = tuple(additional_read_paths or ())
         self._max_output = max_output
         self._validator = (
-            PathValidator(workspace=workspace, additional_read_paths=additional_read_paths)
-            if workspace else None
+            _get_validator(self._workspace, self._additional_read_paths)
+            if self._workspace else None
         )
 
     def set_workspace(self, workspace: Path | str) -> None:
         """Set the workspace boundary for path validation."""
         self._workspace = Path(workspace).resolve()
-        self._validator = PathValidator(
-            workspace=self._workspace,
-            additional_read_paths=self._additional_read_paths,
-        )
+        self._validator = _get_validator(self._workspace, self._additional_read_paths)
         set_default_validator(self._validator)
 
     @property
@@ -119,6 +147,7 @@ class ReadFileTool(Tool):
 
             file_path = result.resolved_path
             assert file_path is not None
+            file_path_str = str(file_path)
 
             if self._is_unrequested_session_transcript_path(file_path):
                 return (
@@ -128,17 +157,18 @@ class ReadFileTool(Tool):
                     "create the requested artifact instead of reading sessions/."
                 )
 
-            if not file_path.exists():
+            # One stat answers both "exists" and "is a regular file".
+            try:
+                is_file = stat.S_ISREG(os.stat(file_path_str).st_mode)
+            except (FileNotFoundError, NotADirectoryError):
                 return f"Error: File not found: {path}"
-            if not file_path.is_file():
+            if not is_file:
                 return f"Error: Not a file: {path}"
 
-            try:
-                async with aiofiles.open(file_path, "r", encoding=encoding) as f:
-                    content = await f.read()
-            except UnicodeDecodeError:
-                async with aiofiles.open(file_path, "r", encoding="latin-1") as f:
-                    content = await f.read()
+            # One worker-thread hop for the whole read (aiofiles would take
+            # one each for open, read and close).
+            data = await asyncio.to_thread(_read_file_bytes, file_path_str)
+            content = _decode_text(data, encoding)
 
             content_fingerprint = hashlib.sha256(content.encode("utf-8")).hexdigest()
             all_lines = content.split("\n")
@@ -215,13 +245,13 @@ class ReadFileTool(Tool):
             duplicate_read = None
             if coverage_line_count > 0:
                 duplicate_read = suppress_redundant_file_read(
-                    str(file_path),
+                    file_path_str,
                     offset=coverage_start_line,
                     limit=coverage_line_count,
                     total_lines=total_lines,
                     content_fingerprint=content_fingerprint,
                     request_key=(
-                        f"{file_path}\x1f{offset if offset is not None else ''}"
+                        f"{file_path_str}\x1f{offset if offset is not None else ''}"
                         f"\x1f{limit if limit is not None else ''}"
                         f"\x1f{content_fingerprint}"
                     ),
@@ -239,7 +269,7 @@ class ReadFileTool(Tool):
             full_result = _build_result(full_content)
             read_metadata = {
                 "path": str(display_path),
-                "resolved_path": str(file_path),
+                "resolved_path": file_path_str,
                 "sha256": content_fingerprint,
                 "bytes": len(full_content.encode("utf-8", errors="replace")),
                 "lines": total_lines,
@@ -520,12 +550,12 @@ class WriteFileTool(Tool):
                        directory will be rejected for security.
         """
         self._workspace = Path(workspace).resolve() if workspace else None
-        self._validator = PathValidator(workspace=workspace) if workspace else None
+        self._validator = _get_validator(self._workspace) if self._workspace else None
 
     def set_workspace(self, workspace: Path | str) -> None:
         """Set the workspace boundary for path validation."""
         self._workspace = Path(workspace).resolve()
-        self._validator = PathValidator(workspace=self._workspace)
+        self._validator = _get_validator(self._workspace)
         set_default_validator(self._validator)
 
     @property
@@ -587,7 +617,7 @@ class WriteFileTool(Tool):
             file_path = result.resolved_path
             assert file_path is not None  # Guaranteed by valid=True
 
-            if file_path.exists() and file_path.is_file():
+            if file_path.is_file():
                 try:
                     existing = file_path.read_text(encoding="utf-8")
                 except UnicodeDecodeError:
@@ -653,12 +683,12 @@ class EditFileTool(Tool):
                        directory will be rejected for security.
         """
         self._workspace = Path(workspace).resolve() if workspace else None
-        self._validator = PathValidator(workspace=workspace) if workspace else None
+        self._validator = _get_validator(self._workspace) if self._workspace else None
 
     def set_workspace(self, workspace: Path | str) -> None:
         """Set the workspace boundary for path validation."""
         self._workspace = Path(workspace).resolve()
-        self._validator = PathValidator(workspace=self._workspace)
+        self._validator = _get_validator(self._workspace)
         set_default_validator(self._validator)
 
     @property
@@ -775,19 +805,16 @@ class ListDirTool(Tool):
         additional_read_paths: list[Path | str] | None = None,
     ):
         self._workspace = Path(workspace).resolve() if workspace else None
-        self._additional_read_paths = additional_read_paths
+        self._additional_read_paths = tuple(additional_read_paths or ())
         self._validator = (
-            PathValidator(workspace=workspace, additional_read_paths=additional_read_paths)
-            if workspace else None
+            _get_validator(self._workspace, self._additional_read_paths)
+            if self._workspace else None
         )
 
     def set_workspace(self, workspace: Path | str) -> None:
         """Set the workspace boundary for path validation."""
         self._workspace = Path(workspace).resolve()
-        self._validator = PathValidator(
-            workspace=self._workspace,
-            additional_read_paths=self._additional_read_paths,
-        )
+        self._validator = _get_validator(self._workspace, self._additional_read_paths)
         set_default_validator(self._validator)
 
     @property
@@ -844,23 +871,32 @@ class ListDirTool(Tool):
                 return f"Error: Not a directory: {path}"
 
             items = []
-            for item in sorted(dir_path.iterdir()):
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+            for item in entries:
                 # Skip hidden files unless requested
                 if not show_hidden and item.name.startswith("."):
                     continue
 
-                if item.is_dir():
-                    items.append(f"[DIR]  {item.name}/")
-                elif item.is_symlink():
-                    # Check if symlink target is safe to show
+                # Check for a link before anything that follows one: is_dir()
+                # on a link to /etc would otherwise list it as a plain [DIR].
+                # DirEntry answers from the directory read, without an lstat.
+                if item.is_symlink():
+                    # Only links that stay inside the readable roots are
+                    # listed like what they point to.
                     try:
-                        target = item.resolve()
-                        if self._workspace and not self._is_within_workspace(target):
-                            items.append(f"[LINK] {item.name} -> (outside workspace)")
-                        else:
-                            items.append(f"[LINK] {item.name}")
+                        target = Path(item.path).resolve(strict=True)
                     except OSError:
                         items.append(f"[LINK] {item.name} -> (broken)")
+                        continue
+                    if not self._is_readable_root_path(target):
+                        items.append(f"[LINK] {item.name} -> (outside workspace)")
+                    elif target.is_dir():
+                        items.append(f"[DIR]  {item.name}/")
+                    else:
+                        items.append(f"[LINK] {item.name}")
+                elif item.is_dir():
+                    items.append(f"[DIR]  {item.name}/")
                 else:
                     # Show file size
                     try:
@@ -894,3 +930,12 @@ class ListDirTool(Tool):
             return True
         except ValueError:
             return False
+
+    def _is_readable_root_path(self, path: Path) -> bool:
+        """Check if a resolved path is within the workspace or a read path."""
+        if self._is_within_workspace(path):
+            return True
+        return any(
+            path.is_relative_to(Path(root).expanduser().resolve())
+            for root in self._additional_read_paths
+        )
@@ -4,8 +4,10 @@ This module provides security utilities to ensure filesystem operations
 stay within allowed workspace boundaries and cannot access sensitive paths.
 """
 
+import functools
 import os
 import platform
+import re
 from pathlib import Path
 from typing import NamedTuple
 
@@ -133,8 +135,20 @@ class PathValidator:
                 Path(p).expanduser().resolve() for p in additional_read_paths
             ]
 
+        # Boundary checks compare strings against these precomputed roots
+        # instead of calling Path.relative_to (which raises on every miss).
+        self._workspace_root = self._boundary_root(self._workspace)
+        self._additional_read_roots = [
+            self._boundary_root(p) for p in self._additional_read_paths
+        ]
+
         # Build the blocklist based on platform
         self._blocklist = self._build_blocklist()
+        self._normalized_workspace = self._normalize_path_for_check(self._workspace)
+        # One regex scan tells whether any pattern occurs at all; the
+        # per-pattern loops only run on a hit, to apply the exceptions.
+        self._blocklist_re = self._compile_any(self._blocklist)
+        self._sensitive_re = self._compile_any(p.lower() for p in self.SENSITIVE_PATTERNS)
 
     @property
     def workspace(self) -> Path:
@@ -156,6 +170,11 @@ class PathValidator:
 
         return blocklist
 
+    @staticmethod
+    def _compile_any(patterns) -> re.Pattern[str]:
+        """Compile literal *patterns* into a regex matching any of them."""
+        return re.compile("|".join(re.escape(p) for p in sorted(patterns)))
+
     def _normalize_path_for_check(self, path: Path) -> str:
         """Normalize a path for blocklist checking."""
         path_str = str(path)
@@ -177,11 +196,12 @@ class PathValidator:
         """
         normalized = self._normalize_path_for_check(resolved_path)
         is_within_workspace = self._is_within_workspace(resolved_path)
-        normalized_workspace = self._normalize_path_for_check(self._workspace)
+        normalized_workspace = self._normalized_workspace
 
         # Check against blocklist patterns
         # Only block patterns outside workspace (allows project-specific .env, etc.)
-        for pattern in self._blocklist:
+        blocklist = self._blocklist if self._blocklist_re.search(normalized) else ()
+        for pattern in blocklist:
             if pattern in normalized:
                 if is_within_workspace and pattern in normalized_workspace:
                     continue
@@ -199,12 +219,28 @@ class PathValidator:
             and not self._is_within_additional_read_paths(resolved_path)
         ):
             filename = resolved_path.name.lower()
+            if not self._sensitive_re.search(filename):
+                return False, None
             for pattern in self.SENSITIVE_PATTERNS:
                 if pattern.lower() in filename:
                     return True, f"Access to files matching pattern '{pattern}' outside workspace is blocked"
 
         return False, None
 
+    def _boundary_root(self, root: Path) -> tuple[str, str]:
+        """Return ``(root, root + sep)`` in the form used by ``_is_under``."""
+        root_str = self._boundary_str(root)
+        prefix = root_str if root_str.endswith(os.sep) else root_str + os.sep
+        return root_str, prefix
+
+    def _boundary_str(self, path: Path) -> str:
+        """String form of *path* for boundary comparison (case-folded on Windows)."""
+        return os.path.normcase(str(path)) if self._is_windows else str(path)
+
+    def _is_under(self, resolved_path: Path, root: tuple[str, str]) -> bool:
+        path_str = self._boundary_str(resolved_path)
+        return path_str == root[0] or path_str.startswith(root[1])
+
     def _is_within_workspace(self, resolved_path: Path) -> bool:
         """
         Check if a resolved path is within the workspace.
@@ -215,28 +251,24 @@ class PathValidator:
         Returns:
             True if the path is within the workspace.
         """
-        try:
-            resolved_path.relative_to(self._workspace)
-            return True
-        except ValueError:
-            return False
+        return self._is_under(resolved_path, self._workspace_root)
 
     def _is_within_additional_read_paths(self, resolved_path: Path) -> bool:
         """Check if *resolved_path* falls under any additional read path."""
-        for allowed in self._additional_read_paths:
-            try:
-                resolved_path.relative_to(allowed)
-                return True
-            except ValueError:
-                continue
-        return False
+        return any(
+            self._is_under(resolved_path, root) for root in self._additional_read_roots
+        )
 
-    def _check_symlink_target(self, path: Path) -> tuple[bool, str | None]:
+    def _check_symlink_target(
+        self, path: Path, target: Path | None = None,
+    ) -> tuple[bool, str | None]:
         """
         Check if a symlink's target escapes the workspace.
 
         Args:
             path: The path to check (may or may not be a symlink).
+            target: ``path`` already resolved with ``strict=True``, if the
+                    caller has it; saves resolving the chain a second time.
 
         Returns:
             Tuple of (is_safe, error_message).
@@ -245,8 +277,11 @@ class PathValidator:
             return True, None
 
         try:
-            # Get the target of the symlink
-            target = path.resolve(strict=True)
+            # Get the target of the symlink. A strict resolve follows the
+            # whole chain (with its own loop detection), so the result is
+            # never itself a symlink and needs no further checks.
+            if target is None:
+                target = path.resolve(strict=True)
 
             # Check if target is within workspace or an explicitly allowed
             # read-only root, such as an installed skill directory outside the
@@ -257,10 +292,6 @@ class PathValidator:
             ):
                 return False, f"Symlink target '{target}' escapes workspace boundary"
 
-            # Recursively check if target is also a symlink
-            if target.is_symlink():
-                return self._check_symlink_target(target)
-
             return True, None
 
         except OSError as e:
@@ -292,15 +323,22 @@ class PathValidator:
             path = self._normalize_posix_on_windows(str(path))
             raw_path = Path(path).expanduser()
 
-            # Resolve relative paths against workspace first (not CWD)
+            # Resolve relative paths against workspace first (not CWD). A
+            # strict resolve doubles as the existence check, so the common
+            # case walks the path once instead of stat-ing it and resolving.
+            resolved = None
             if not raw_path.is_absolute() and self._workspace:
                 ws_candidate = (self._workspace / raw_path)
-                if ws_candidate.exists():
+                try:
+                    resolved = ws_candidate.resolve(strict=True)
                     raw_path = ws_candidate
+                except (FileNotFoundError, NotADirectoryError):
+                    pass
 
             # For read operations, try to resolve strictly (file must exist)
             try:
-                resolved = raw_path.resolve(strict=True)
+                if resolved is None:
+                    resolved = raw_path.resolve(strict=True)
             except FileNotFoundError:
                 resolved = raw_path.resolve(strict=False)
                 if (
@@ -337,7 +375,7 @@ class PathValidator:
                 return PathValidationResult(valid=False, resolved_path=None, error=reason)
 
             # Check symlinks
-            symlink_safe, symlink_error = self._check_symlink_target(raw_path)
+            symlink_safe, symlink_error = self._check_symlink_target(raw_path, resolved)
             if not symlink_safe:
                 return PathValidationResult(
                     valid=False,
@@ -462,6 +500,35 @@ def set_default_validator(validator: PathValidator) -> None:
     _default_validator = validator
 
 
+def _get_validator(
+    workspace: Path | str,
+    additional_read_paths: tuple[Path | str, ...] = (),
+) -> PathValidator:
+    """
+    Return the shared validator for the resolved *workspace*.
+
+    Validators are immutable after construction, so tools and the
+    convenience functions below can share one per workspace. The cache is
+    keyed on resolved paths: a relative or symlinked workspace must not
+    reuse a validator built against an earlier cwd or link target.
+    """
+    return _cached_validator(
+        Path(workspace).expanduser().resolve(),
+        tuple(Path(p).expanduser().resolve() for p in additional_read_paths),
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_validator(
+    workspace: Path,
+    additional_read_paths: tuple[Path, ...],
+) -> PathValidator:
+    return PathValidator(
+        workspace=workspace,
+        additional_read_paths=list(additional_read_paths) or None,
+    )
+
+
 def validate_read_path(path: str | Path, workspace: Path | None = None) -> PathValidationResult:
     """
     Convenience function to validate a read path.
@@ -474,7 +541,7 @@ def validate_read_path(path: str | Path, workspace: Path | None = None) -> PathV
         PathValidationResult with validation status.
     """
     if workspace is not None:
-        validator = PathValidator(workspace=workspace)
+        validator = _get_validator(workspace)
     else:
         validator = get_default_validator()
     return validator.validate_read_path(path)
@@ -492,7 +559,7 @@ def validate_write_path(path: str | Path, workspace: Path | None = None) -> Path
         PathValidationResult with validation status.
     """
     if workspace is not None:
-        validator = PathValidator(workspace=workspace)
+        validator = _get_validator(workspace)
     else:
         validator = get_default_validator()
     return validator.validate_write_path(path)
@@ -510,7 +577,7 @@ def validate_directory_path(path: str | Path, workspace: Path | None = None) ->
         PathValidationResult with validation status.
     """
     if workspace is not None:
-        validator = PathValidator(workspace=workspace)
+        validator = _get_validator(workspace)
     else:
         validator = get_default_validator()
     return validator.validate_directory_path(path)
@@ -12,6 +12,7 @@ import signal
 import subprocess
 import sys
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
@@ -64,6 +65,20 @@ def _scrub_env(env: dict[str, str]) -> dict[str, str]:
     return env
 
 
+def _compile_command_blocklist(commands) -> re.Pattern[str] | None:
+    """Compile blocked command strings into one boundary-anchored regex.
+
+    Matches (lowercased) any of *commands* at the start of a command or
+    after a shell separator; group 1 is the blocked string that matched.
+    Longer strings are tried first so the most specific one is reported.
+    """
+    lowered = sorted({c.lower() for c in commands}, key=len, reverse=True)
+    if not lowered:
+        return None
+    alternation = "|".join(re.escape(c) for c in lowered)
+    return re.compile(rf"(?:^|[\s;|&])({alternation})")
+
+
 class CommandValidator:
     """
     Validates shell commands for security risks.
@@ -104,6 +119,8 @@ class CommandValidator:
         "del /f /s /q c:\\",
         "rd /s /q c:\\",
     })
+    _DANGEROUS_COMMANDS_RE = _compile_command_blocklist(DANGEROUS_COMMANDS)
+    _DANGEROUS_BY_LOWER = {c.lower(): c for c in DANGEROUS_COMMANDS}
 
     # Regex patterns for dangerous operations
     DANGEROUS_PATTERNS = [
@@ -165,6 +182,11 @@ class CommandValidator:
         "~/.zshrc",
         "/root/",
     })
+    # All of SENSITIVE_PATHS as one substring alternation, longest first, so
+    # strict mode scans the command once instead of once per path.
+    _SENSITIVE_PATHS_RE = re.compile("|".join(
+        re.escape(path) for path in sorted(SENSITIVE_PATHS, key=len, reverse=True)
+    ))
 
     # Default allowed commands (whitelist mode)
     DEFAULT_WHITELIST = frozenset({
@@ -207,6 +229,12 @@ class CommandValidator:
         "bash", "sh", "zsh", "source", "export", "set",
     })
 
+    # Bound on the number of cached validate() verdicts per validator.
+    _VALIDATE_CACHE_SIZE = 1024
+    # Longer commands are validated every time instead of being kept in the
+    # cache: they are rarely repeated and may embed data or credentials.
+    _VALIDATE_CACHE_MAX_COMMAND = 256
+
     def __init__(
         self,
         whitelist_mode: bool = False,
@@ -232,16 +260,67 @@ class CommandValidator:
                 Enables running commands with variable expansion and template literals.
             strict_mode: If True, block all potentially dangerous patterns.
         """
-        self.whitelist_mode = whitelist_mode
-        self.whitelist = self.DEFAULT_WHITELIST.copy()
+        # The policy is fixed at construction (and exposed read-only below):
+        # it is compiled into patterns here and validate() caches verdicts.
+        self._whitelist_mode = whitelist_mode
+        self._whitelist = self.DEFAULT_WHITELIST
         if custom_whitelist:
-            self.whitelist = self.whitelist | custom_whitelist
+            self._whitelist = self._whitelist | custom_whitelist
+
+        self._custom_blocklist = frozenset(custom_blocklist or ())
+        self._allow_pipes = allow_pipes
+        self._allow_chaining = allow_chaining
+        self._allow_substitution = allow_substitution
+        self._strict_mode = strict_mode
+
+        # Resolve per-instance settings into ready-to-run patterns once,
+        # rather than re-deciding them on every validate() call.
+        self._custom_blocklist_re = _compile_command_blocklist(self.custom_blocklist)
+        self._custom_by_lower = {b.lower(): b for b in self.custom_blocklist}
+        self._injection_patterns = tuple(
+            pattern for pattern in self.INJECTION_PATTERNS
+            if not (allow_chaining and pattern.pattern in self._CHAINING_PATTERNS)
+            and not (allow_substitution and pattern.pattern in self._SUBSTITUTION_PATTERNS)
+        )
+
+        # LRU of recent verdicts: agents re-issue the same few commands
+        # (ls, git status, pwd) many times per session.
+        self._validate_cache: OrderedDict[str, tuple[bool, str | None]] = OrderedDict()
 
-        self.custom_blocklist = custom_blocklist or set()
-        self.allow_pipes = allow_pipes
-        self.allow_chaining = allow_chaining
-        self.allow_substitution = allow_substitution
-        self.strict_mode = strict_mode
+    @property
+    def whitelist_mode(self) -> bool:
+        """Whether only whitelisted commands are allowed."""
+        return self._whitelist_mode
+
+    @property
+    def whitelist(self) -> frozenset[str]:
+        """Base commands allowed in whitelist mode."""
+        return self._whitelist
+
+    @property
+    def custom_blocklist(self) -> frozenset[str]:
+        """Extra commands/patterns blocked on top of the defaults."""
+        return self._custom_blocklist
+
+    @property
+    def allow_pipes(self) -> bool:
+        """Whether the pipe operator is allowed."""
+        return self._allow_pipes
+
+    @property
+    def allow_chaining(self) -> bool:
+        """Whether command chaining (&&, ||, ;) is allowed."""
+        return self._allow_chaining
+
+    @property
+    def allow_substitution(self) -> bool:
+        """Whether command substitution is allowed."""
+        return self._allow_substitution
+
+    @property
+    def strict_mode(self) -> bool:
+        """Whether sensitive paths are blocked as well."""
+        return self._strict_mode
 
     def _extract_base_command(self, command: str) -> str:
         """Extract the base command from a full command string."""
@@ -272,26 +351,17 @@ class CommandValidator:
 
         # Check dangerous commands — match only when the dangerous string
         # appears as the start of the command or after a shell separator,
-        # not inside an unrelated substring like a URL query parameter.
-        for dangerous in self.DANGEROUS_COMMANDS:
-            d_lower = dangerous.lower()
-            # Quick substring pre-check
-            if d_lower not in cmd_lower:
-                continue
-            # Build a word-boundary regex so "format c:" matches but
-            # "?format=3" does not.
-            escaped = re.escape(d_lower)
-            if re.search(rf"(?:^|[\s;|&]){escaped}", cmd_lower):
-                return f"Blocked dangerous command: '{dangerous}'"
+        # not inside an unrelated substring like a URL query parameter
+        # (so "format c:" matches but "?format=3" does not).
+        match = self._DANGEROUS_COMMANDS_RE.search(cmd_lower)
+        if match:
+            return f"Blocked dangerous command: '{self._DANGEROUS_BY_LOWER[match.group(1)]}'"
 
         # Check custom blocklist with same boundary logic
-        for blocked in self.custom_blocklist:
-            b_lower = blocked.lower()
-            if b_lower not in cmd_lower:
-                continue
-            escaped = re.escape(b_lower)
-            if re.search(rf"(?:^|[\s;|&]){escaped}", cmd_lower):
-                return f"Blocked by custom blocklist: '{blocked}'"
+        if self._custom_blocklist_re is not None:
+            match = self._custom_blocklist_re.search(cmd_lower)
+            if match:
+                return f"Blocked by custom blocklist: '{self._custom_by_lower[match.group(1)]}'"
 
         # Check regex patterns
         for pattern in self.DANGEROUS_PATTERNS:
@@ -311,13 +381,9 @@ class CommandValidator:
 
     def _check_injection_patterns(self, command: str) -> str | None:
         """Check for shell injection patterns."""
-        for pattern in self.INJECTION_PATTERNS:
-            # Skip chaining patterns when allow_chaining is enabled
-            if self.allow_chaining and pattern.pattern in self._CHAINING_PATTERNS:
-                continue
-            # Skip substitution patterns when allow_substitution is enabled
-            if self.allow_substitution and pattern.pattern in self._SUBSTITUTION_PATTERNS:
-                continue
+        # Chaining/substitution patterns were already dropped in __init__
+        # when allow_chaining/allow_substitution are enabled.
+        for pattern in self._injection_patterns:
             match = pattern.search(command)
             if match:
                 return f"Potential command injection detected: '{match.group()}'"
@@ -330,9 +396,9 @@ class CommandValidator:
 
     def _check_sensitive_paths(self, command: str) -> str | None:
         """Check if command accesses sensitive paths."""
-        for path in self.SENSITIVE_PATHS:
-            if path in command:
-                return f"Access to sensitive path blocked: '{path}'"
+        match = self._SENSITIVE_PATHS_RE.search(command)
+        if match:
+            return f"Access to sensitive path blocked: '{match.group()}'"
         return None
 
     def _check_whitelist(self, command: str) -> str | None:
@@ -353,6 +419,10 @@ class CommandValidator:
         """
         Validate a command for security risks.
 
+        Verdicts for commands up to ``_VALIDATE_CACHE_MAX_COMMAND``
+        characters are cached per validator; its settings are read-only,
+        so a cached verdict cannot go stale.
+
         Args:
             command: The command to validate.
 
@@ -360,6 +430,21 @@ class CommandValidator:
             Tuple of (is_valid, error_message).
             If is_valid is False, error_message contains the reason.
         """
+        cache = self._validate_cache
+        result = cache.get(command)
+        if result is not None:
+            cache.move_to_end(command)
+            return result
+
+        result = self._validate_uncached(command)
+        if len(command) <= self._VALIDATE_CACHE_MAX_COMMAND:
+            cache[command] = result
+            if len(cache) > self._VALIDATE_CACHE_SIZE:
+                cache.popitem(last=False)
+        return result
+
+    def _validate_uncached(self, command: str) -> tuple[bool, str | None]:
+        """Run every check for ``command``; see :meth:`validate`."""
         if not command or not command.strip():
             return False, "Empty command"
 
@@ -384,6 +469,8 @@ class CommandValidator:
         if error:
             return False, error
 
+        # A constant tuple: the passing path allocates nothing, and messages
+        # are only formatted for commands that are actually rejected.
         return True, None
 
     def sanitize_for_display(self, command: str, max_length: int = 100) -> str:
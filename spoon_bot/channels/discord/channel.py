@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
 import re
 import time
 from collections import OrderedDict
@@ -481,15 +482,15 @@ class DiscordChannel(BaseChannel):
     def _check_rate_limit(self, user_id: int) -> bool:
         """Return True if the user is within rate limits, False if throttled."""
         now = time.monotonic()
-        timestamps = self._user_rate_limits.get(user_id, [])
-        # Purge expired entries
-        cutoff = now - self._rate_limit_window
-        timestamps = [t for t in timestamps if t > cutoff]
+        timestamps = self._user_rate_limits.setdefault(user_id, [])
+        # Purge expired entries: timestamps are appended in monotonic order,
+        # so the expired ones are a prefix that can be dropped in place.
+        expired = bisect.bisect_right(timestamps, now - self._rate_limit_window)
+        if expired:
+            del timestamps[:expired]
         if len(timestamps) >= self._rate_limit_max:
-            self._user_rate_limits[user_id] = timestamps
             return False
         timestamps.append(now)
-        self._user_rate_limits[user_id] = timestamps
         return True
 
     def _cleanup_stale_reactions(self) -> None:
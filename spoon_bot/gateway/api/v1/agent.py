@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import dataclasses
+import functools
 import inspect
 import json
 import time
@@ -13,7 +15,8 @@ from typing import Annotated, Any, AsyncGenerator
 from uuid import uuid4
 
 from fastapi import APIRouter, File, Form, HTTPException, UploadFile, status
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, TypeAdapter
 
 from spoon_bot.gateway.app import (
     get_agent,
@@ -74,9 +77,215 @@ def _get_agent_response_source(agent) -> ResponseSource:
     return ResponseSource()
 
 
-def _format_sse_event(event: str, payload: dict[str, Any]) -> str:
+# SSE frames are built as UTF-8 bytes: StreamingResponse sends bytes as-is,
+# whereas a str frame would be encoded again for every chunk.
+_STREAM_CHUNK_ADAPTER = TypeAdapter(StreamChunk)
+_SSE_DONE = b"data: [DONE]\n\n"
+# Content tokens share one SSE frame for at most this long after the first
+# of them arrived, and until the merged delta reaches _SSE_COALESCE_MAX_CHARS.
+_SSE_COALESCE_WINDOW = 0.005
+_SSE_COALESCE_MAX_CHARS = 4096
+
+
+class PydanticResponse(JSONResponse):
+    """JSON response rendered straight from a Pydantic model.
+
+    Returning a plain model makes FastAPI run ``jsonable_encoder`` over it
+    and then ``json.dumps`` the resulting dicts; this serializes once.
+    """
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.model_dump_json().encode()
+
+
+def _format_sse_event(event: str, payload: dict[str, Any]) -> bytes:
     """Format one SSE event frame."""
-    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+    return b"".join((
+        b"event: ",
+        event.encode(),
+        b"\ndata: ",
+        json.dumps(payload, ensure_ascii=False).encode(),
+        b"\n\n",
+    ))
+
+
+def _format_sse_chunk(chunk: StreamChunk) -> bytes:
+    """Format one unnamed SSE data frame carrying a stream chunk.
+
+    ``b"".join`` sizes the frame once; chaining ``+`` would copy the JSON
+    payload into an intermediate bytes object on every token.
+    """
+    return b"".join((b"data: ", _STREAM_CHUNK_ADAPTER.dump_json(chunk), b"\n\n"))
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_response_source(items: tuple[tuple[str, Any], ...]) -> ResponseSource:
+    """Return a shared ResponseSource for one set of source fields.
+
+    Every event of a stream carries the same source dict, so one model per
+    distinct source is built and reused; callers only serialize it.
+    """
+    return ResponseSource(**dict(items))
+
+
+def _stream_event_chunk(chunk_type: str, chunk_data: dict[str, Any]) -> StreamChunk:
+    """Build the StreamChunk for one ``agent.stream()`` event.
+
+    This runs once per streamed token. Events from AgentLoop already carry
+    a str delta and a dict metadata, so those skip model validation; any
+    other shape still goes through the validating constructor.
+    """
+    delta = chunk_data["delta"]
+    metadata = chunk_data.get("metadata", {})
+    source_data = chunk_data.get("source") or {}
+    try:
+        source = _cached_response_source(tuple(source_data.items()))
+    except TypeError:  # unhashable field values
+        source = ResponseSource(**source_data)
+    if isinstance(chunk_type, str) and isinstance(delta, str) and isinstance(metadata, dict):
+        return StreamChunk.model_construct(
+            type=chunk_type, delta=delta, metadata=metadata, source=source,
+        )
+    return StreamChunk(type=chunk_type, delta=delta, metadata=metadata, source=source)
+
+
+def _merge_content_event(
+    held: dict[str, Any] | None, event: dict[str, Any],
+) -> dict[str, Any] | None:
+    """Return ``held`` extended by ``event``'s delta, or None if they differ.
+
+    Only content events from the same source and stream segment merge; the
+    first event's metadata (including ``segment_start``) is kept.
+    """
+    if held is None or event.get("type") != "content":
+        return None
+    delta = event.get("delta")
+    if not isinstance(delta, str) or event.get("source") != held.get("source"):
+        return None
+    metadata = event.get("metadata") or {}
+    held_metadata = held.get("metadata") or {}
+    if not isinstance(metadata, dict) or not isinstance(held_metadata, dict):
+        return None
+    if metadata.get("segment_start"):
+        return None
+    if _segment_metadata(metadata) != _segment_metadata(held_metadata):
+        return None
+    return {**held, "delta": held["delta"] + delta}
+
+
+def _segment_metadata(metadata: dict[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in metadata.items() if key != "segment_start"}
+
+
+async def _coalesce_content_events(
+    events: AsyncGenerator[dict[str, Any], None],
+    window: float,
+    max_chars: int = _SSE_COALESCE_MAX_CHARS,
+) -> AsyncGenerator[dict[str, Any], None]:
+    """Merge content events that arrive within ``window`` seconds of each other.
+
+    Each SSE frame costs a serialization and an ASGI send, and providers often
+    emit tokens in bursts. A held event is flushed ``window`` seconds after it
+    started, however steadily tokens keep arriving, or as soon as its delta
+    reaches ``max_chars``. The upstream generator is driven by a single pump
+    task for its whole life, so context variables it sets and resets across
+    yields (such as the agent loop's ledger and tool bindings) always see the
+    same context. The pump is cancelled, closing the generator, when the
+    stream ends.
+    """
+    queue: asyncio.Queue[tuple[dict[str, Any] | None, BaseException | None]] = (
+        asyncio.Queue(maxsize=1)
+    )
+
+    async def pump() -> None:
+        try:
+            async with contextlib.aclosing(events):
+                async for event in events:
+                    await queue.put((event, None))
+        except (Exception, asyncio.CancelledError) as exc:
+            if asyncio.current_task().cancelling():
+                raise  # Cancelled by the coalescer below; nobody is reading.
+            # Includes a CancelledError raised by the agent itself, which
+            # must reach the SSE handler rather than end the pump silently.
+            await queue.put((None, exc))
+        else:
+            await queue.put((None, None))
+
+    loop = asyncio.get_running_loop()
+    pump_task = asyncio.create_task(pump())
+    held: dict[str, Any] | None = None
+    flush_at = 0.0
+    try:
+        while True:
+            if held is None:
+                event, error = await queue.get()
+            else:
+                remaining = flush_at - loop.time()
+                if remaining > 0:
+                    try:
+                        event, error = await asyncio.wait_for(queue.get(), remaining)
+                    except TimeoutError:
+                        remaining = 0
+                if remaining <= 0:
+                    yield held
+                    held = None
+                    continue
+            if event is None:
+                # Deliver what was already streamed before the end or failure.
+                if held is not None:
+                    yield held
+                    held = None
+                if error is not None:
+                    raise error
+                break
+
+            merged = _merge_content_event(held, event)
+            if merged is not None:
+                if len(merged["delta"]) >= max_chars:
+                    yield merged
+                    held = None
+                else:
+                    held = merged
+                continue
+            if held is not None:
+                yield held
+                held = None
+            if event.get("type") == "content" and isinstance(event.get("delta"), str):
+                held = event
+                flush_at = loop.time() + window
+            else:
+                yield event
+    finally:
+        if not pump_task.done():
+            pump_task.cancel()
+        try:
+            await pump_task
+        except asyncio.CancelledError:
+            pass
+
+
+def _sse_response(
+    events: AsyncGenerator[bytes, None],
+    *,
+    request_id: str,
+    trace_id: str,
+) -> StreamingResponse:
+    """Wrap pre-encoded SSE frames in a ``text/event-stream`` response.
+
+    The frames are already JSON-serialized bytes, so this stays a plain
+    ``StreamingResponse``; FastAPI's ``EventSourceResponse`` only encodes
+    events for path operations that are generators themselves.
+    """
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Request-ID": request_id,
+            "X-Trace-ID": trace_id,
+        },
+    )
 
 
 def _resolve_session_key(request_session_key: str, user: CurrentUser) -> str:
@@ -216,12 +425,12 @@ async def _stream_sse(
     request_id: str | None = None,
     user_id: str | None = None,
     cancel_event: asyncio.Event | None = None,
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """Generate SSE events from agent streaming."""
     resolved_trace_id = trace_id or new_trace_id()
     resolved_request_id = request_id or f"req_{uuid4().hex[:12]}"
     span = TimerSpan("rest_sse")
-    streamed_content = ""
+    streamed_any_content = False
     yield _format_sse_event(
         "trace",
         {
@@ -255,7 +464,9 @@ async def _stream_sse(
                 kwargs["attachments"] = attachments
 
             try:
-                stream_iter = agent.stream(**kwargs)
+                stream_iter = _coalesce_content_events(
+                    agent.stream(**kwargs), _SSE_COALESCE_WINDOW,
+                )
                 try:
                     while True:
                         try:
@@ -292,7 +503,7 @@ async def _stream_sse(
                                 metadata=chunk_data.get("metadata", {}),
                                 source=ResponseSource(**(chunk_data.get("source") or {})),
                             )
-                            yield f"data: {error_chunk.model_dump_json()}\n\n"
+                            yield _format_sse_chunk(error_chunk)
                             continue
 
                         # Filter out "done" chunks; clients use [DONE] as the completion signal.
@@ -303,26 +514,25 @@ async def _stream_sse(
                                 if isinstance(done_metadata, dict)
                                 else ""
                             )
-                            if not streamed_content and isinstance(done_content, str) and done_content:
+                            if (
+                                not streamed_any_content
+                                and isinstance(done_content, str)
+                                and done_content
+                            ):
                                 fallback_chunk = StreamChunk(
                                     type="content",
                                     delta=done_content,
                                     metadata={"fallback": "done_metadata_content"},
                                     source=ResponseSource(**(chunk_data.get("source") or {})),
                                 )
-                                yield f"data: {fallback_chunk.model_dump_json()}\n\n"
-                                streamed_content = done_content
+                                yield _format_sse_chunk(fallback_chunk)
+                                streamed_any_content = True
                             continue
 
-                        chunk = StreamChunk(
-                            type=chunk_type,
-                            delta=chunk_data["delta"],
-                            metadata=chunk_data.get("metadata", {}),
-                            source=ResponseSource(**(chunk_data.get("source") or {})),
-                        )
-                        yield f"data: {chunk.model_dump_json()}\n\n"
+                        chunk = _stream_event_chunk(chunk_type, chunk_data)
+                        yield _format_sse_chunk(chunk)
                         if chunk_type == "content" and chunk.delta:
-                            streamed_content += chunk.delta
+                            streamed_any_content = True
                 finally:
                     aclose = getattr(stream_iter, "aclose", None)
                     if callable(aclose):
@@ -334,7 +544,7 @@ async def _stream_sse(
                     metadata={"error": str(e), "trace_id": resolved_trace_id},
                     source=_get_agent_response_source(agent),
                 )
-                yield f"data: {error_chunk.model_dump_json()}\n\n"
+                yield _format_sse_chunk(error_chunk)
             finally:
                 runtime.active_task_id = None
 
@@ -349,7 +559,7 @@ async def _stream_sse(
             },
         ),
     )
-    yield "data: [DONE]\n\n"
+    yield _SSE_DONE
 
 
 @router.post("/chat")
@@ -397,7 +607,7 @@ async def chat(
 
         # Streaming mode: return SSE
         if stream:
-            return StreamingResponse(
+            return _sse_response(
                 _stream_sse(
                     None,
                     message,
@@ -410,13 +620,8 @@ async def chat(
                     request_id=request_id,
                     user_id=getattr(user, "user_id", "anonymous"),
                 ),
-                media_type="text/event-stream",
-                headers={
-                    "Cache-Control": "no-cache",
-                    "Connection": "keep-alive",
-                    "X-Request-ID": request_id,
-                    "X-Trace-ID": trace_id,
-                },
+                request_id=request_id,
+                trace_id=trace_id,
             )
 
         runtime = await get_session_runtime_registry().get_or_create(session_key)
@@ -470,7 +675,7 @@ async def chat(
         request_span.stop()
         timing = build_timing_payload(request_span, extra={"trace_id": trace_id})
 
-        return APIResponse(
+        return PydanticResponse(APIResponse(
             success=True,
             data=ChatResponse(
                 response=response_text,
@@ -486,7 +691,7 @@ async def chat(
                 trace_id=trace_id,
                 timing=timing,
             ),
-        )
+        ))
 
     except HTTPException:
         raise
@@ -925,7 +1130,7 @@ async def voice_chat(
     )
 
     if stream:
-        return StreamingResponse(
+        return _sse_response(
             _stream_sse(
                 None,
                 processed_message,
@@ -937,13 +1142,8 @@ async def voice_chat(
                 request_id=request_id,
                 user_id=getattr(user, "user_id", "anonymous"),
             ),
-            media_type="text/event-stream",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "X-Request-ID": request_id,
-                "X-Trace-ID": trace_id,
-            },
+            request_id=request_id,
+            trace_id=trace_id,
         )
 
     runtime = await get_session_runtime_registry().get_or_create(session_key)
@@ -7,6 +7,20 @@ from typing import Any
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+_ALLOWED_WHITESPACE = str.maketrans("", "", "\n\r\t")
+
+
+def _strip_control_chars(v: str) -> str:
+    """Drop non-printable characters, keeping newlines and tabs.
+
+    Most prompts are already clean, so check that with C-level string
+    methods first and only fall back to the per-character filter when
+    something actually has to be removed.
+    """
+    if v.translate(_ALLOWED_WHITESPACE).isprintable():
+        return v
+    return "".join(c for c in v if c.isprintable() or c in "\n\r\t")
+
 
 class ChatOptions(BaseModel):
     """Options for chat requests."""
@@ -49,7 +63,7 @@ class ChatRequest(BaseModel):
     @classmethod
     def sanitize_message(cls, v: str) -> str:
         """Remove control characters except newlines."""
-        return "".join(c for c in v if c.isprintable() or c in "\n\r\t")
+        return _strip_control_chars(v)
 
 
 class AsyncChatRequest(BaseModel):
@@ -64,7 +78,7 @@ class AsyncChatRequest(BaseModel):
     @classmethod
     def sanitize_message(cls, v: str) -> str:
         """Remove control characters except newlines and reject blank prompts."""
-        sanitized = "".join(c for c in v if c.isprintable() or c in "\n\r\t")
+        sanitized = _strip_control_chars(v)
         if not sanitized.strip():
             raise ValueError("message must not be blank")
         return sanitized
@@ -9,6 +9,7 @@ Based on: docs/plans/2025-02-05-spoon-bot-api-design.md
 from __future__ import annotations
 
 import asyncio
+import bisect
 import inspect
 import os
 import time
@@ -69,6 +70,8 @@ _CONCURRENT_METHODS: frozenset[str] = frozenset({
     "workspace.tree",
 })
 _CONCURRENT_REQUEST_LIMIT = 16
+# Sent once per streamed token; resolve the enum value once.
+_STREAM_CHUNK_EVENT = ServerEvent.AGENT_STREAM_CHUNK.value
 _ATTACHMENT_CONTEXT_HEADER = "Attached workspace files (source of truth for this request):"
 
 
@@ -248,18 +251,21 @@ class _AuthRateLimiter:
         # ip -> list of timestamps of failed attempts
         self._attempts: dict[str, list[float]] = defaultdict(list)
 
+    def _prune(self, attempts: list[float], now: float) -> None:
+        # Timestamps are appended in order: drop the expired prefix in place.
+        del attempts[:bisect.bisect_right(attempts, now - self._window)]
+
     def record_failure(self, ip: str) -> None:
         now = time.monotonic()
-        self._attempts[ip].append(now)
-        # Prune old entries
-        cutoff = now - self._window
-        self._attempts[ip] = [t for t in self._attempts[ip] if t > cutoff]
+        attempts = self._attempts[ip]
+        attempts.append(now)
+        self._prune(attempts, now)
 
     def is_blocked(self, ip: str) -> bool:
-        now = time.monotonic()
-        cutoff = now - self._window
-        attempts = [t for t in self._attempts.get(ip, []) if t > cutoff]
-        self._attempts[ip] = attempts
+        attempts = self._attempts.get(ip)
+        if not attempts:
+            return False
+        self._prune(attempts, time.monotonic())
         return len(attempts) >= self._max
 
     def clear(self, ip: str) -> None:
@@ -832,7 +838,9 @@ class WebSocketHandler:
                     check_budget("request", config.budget.request_timeout_ms, span.elapsed_ms)
 
                     if stream:
-                        full_content = ""
+                        # Deltas are joined once per done event rather than
+                        # re-concatenated on every token.
+                        content_parts: list[str] = []
                         stream_iter = agent.stream(
                             message=message,
                             media=media,
@@ -894,6 +902,7 @@ class WebSocketHandler:
                                     continue
 
                                 if chunk_type == "done":
+                                    full_content = "".join(content_parts)
                                     done_content = (
                                         metadata.get("content", "")
                                         if isinstance(metadata, dict)
@@ -903,7 +912,7 @@ class WebSocketHandler:
                                         if not full_content:
                                             await manager.send_message(
                                                 self.connection_id,
-                                                WSEvent(event=ServerEvent.AGENT_STREAM_CHUNK.value, data={
+                                                WSEvent(event=_STREAM_CHUNK_EVENT, data={
                                                     "task_id": task_id,
                                                     "request_id": request_id,
                                                     "session_key": session_key,
@@ -922,7 +931,7 @@ class WebSocketHandler:
                                         )
                                         await manager.send_message(
                                             self.connection_id,
-                                            WSEvent(event=ServerEvent.AGENT_STREAM_CHUNK.value, data={
+                                            WSEvent(event=_STREAM_CHUNK_EVENT, data={
                                                 "task_id": task_id,
                                                 "request_id": request_id,
                                                 "session_key": session_key,
@@ -946,9 +955,10 @@ class WebSocketHandler:
                                             "source": source,
                                         }),
                                     )
+                                    content_parts = [full_content]
                                 else:
                                     if chunk_type == "content" and delta:
-                                        full_content += delta
+                                        content_parts.append(delta)
                                     elif (
                                         chunk_type == "tool_result"
                                         and not delta
@@ -980,7 +990,7 @@ class WebSocketHandler:
                                     if delta or chunk_type != "content":
                                         await manager.send_message(
                                             self.connection_id,
-                                            WSEvent(event=ServerEvent.AGENT_STREAM_CHUNK.value, data={
+                                            WSEvent(event=_STREAM_CHUNK_EVENT, data={
                                                 "task_id": task_id,
                                                 "request_id": request_id,
                                                 "session_key": session_key,
@@ -996,7 +1006,7 @@ class WebSocketHandler:
                             if callable(aclose):
                                 await aclose()
 
-                        response = full_content
+                        response = "".join(content_parts)
                     else:
                         if thinking:
                             response, thinking_content = await wait_for_budget(
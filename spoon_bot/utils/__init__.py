@@ -12,6 +12,8 @@ from spoon_bot.utils.rate_limit import (
     RateLimiter,
     TokenBucketLimiter,
     SlidingWindowLimiter,
+    SlidingWindowCounterLimiter,
+    UnlimitedLimiter,
     RateLimitConfig,
 )
 from spoon_bot.utils.privacy import mask_secrets
@@ -28,6 +30,8 @@ __all__ = [
     "RateLimiter",
     "TokenBucketLimiter",
     "SlidingWindowLimiter",
+    "SlidingWindowCounterLimiter",
+    "UnlimitedLimiter",
     "RateLimitConfig",
     # Privacy
     "mask_secrets",
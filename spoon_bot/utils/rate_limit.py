@@ -8,21 +8,27 @@ Provides configurable rate limiting for:
 Supports multiple algorithms:
 - Token bucket (allows bursts)
 - Sliding window (strict limits)
+- Sliding window counter (approximate strict limits in constant memory)
 """
 
 import asyncio
+import threading
 import time
-from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
-from typing import Any, Callable, TypeVar
+from typing import Any, Callable, Protocol, TypeVar, runtime_checkable
 
 from loguru import logger
 
+from spoon_bot.utils.errors import RateLimitExceeded
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class RateLimitConfig:
     """Configuration for rate limiting.
 
+    Frozen, so the presets below can hand out shared instances.
+
     Attributes:
         requests_per_second: Maximum requests per second (default 10).
         requests_per_minute: Maximum requests per minute (default 60).
@@ -39,40 +45,103 @@ class RateLimitConfig:
     @classmethod
     def for_llm_api(cls) -> "RateLimitConfig":
         """Rate limit config for LLM API calls (conservative)."""
-        return cls(
-            requests_per_second=2.0,
-            requests_per_minute=30.0,
-            burst_size=3,
-        )
+        return _LLM_API_CONFIG
 
     @classmethod
     def for_shell(cls) -> "RateLimitConfig":
         """Rate limit config for shell commands."""
-        return cls(
-            requests_per_second=5.0,
-            requests_per_minute=100.0,
-            burst_size=10,
-        )
+        return _SHELL_CONFIG
 
     @classmethod
     def for_web_requests(cls) -> "RateLimitConfig":
         """Rate limit config for web requests."""
-        return cls(
-            requests_per_second=3.0,
-            requests_per_minute=50.0,
-            burst_size=5,
-        )
+        return _WEB_REQUESTS_CONFIG
 
     @classmethod
     def unlimited(cls) -> "RateLimitConfig":
         """No rate limiting."""
-        return cls(enabled=False)
+        return _UNLIMITED_CONFIG
+
+
+_LLM_API_CONFIG = RateLimitConfig(
+    requests_per_second=2.0,
+    requests_per_minute=30.0,
+    burst_size=3,
+)
+_SHELL_CONFIG = RateLimitConfig(
+    requests_per_second=5.0,
+    requests_per_minute=100.0,
+    burst_size=10,
+)
+_WEB_REQUESTS_CONFIG = RateLimitConfig(
+    requests_per_second=3.0,
+    requests_per_minute=50.0,
+    burst_size=5,
+)
+_UNLIMITED_CONFIG = RateLimitConfig(enabled=False)
+
+
+_NS_PER_SECOND = 1_000_000_000
+# Fixed-point scale for token counts. Matching it to the clock resolution
+# makes a rate in tokens/second equal to scaled units per nanosecond.
+_TOKEN_SCALE = _NS_PER_SECOND
+# Scaled capacity standing in for an infinite one: over nine billion
+# tokens, more than any caller can drain.
+_UNBOUNDED_SCALED = 2**63 - 1
+
+
+async def _wait_for_capacity(cond: asyncio.Condition, timeout: float) -> None:
+    """Wait on ``cond`` until notified or until ``timeout`` seconds elapse.
+
+    The caller must hold ``cond``; it is held again when this returns. The
+    timeout is the moment capacity is expected, so waiters wake exactly
+    once per refill instead of polling.
+    """
+    try:
+        await asyncio.wait_for(cond.wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+
+
+# Keeps _notify_waiters() tasks alive until they have run.
+_notify_tasks: set[asyncio.Task] = set()
+
+
+async def _notify_all(cond: asyncio.Condition) -> None:
+    """Notify every waiter on ``cond`` while holding its lock."""
+    try:
+        async with cond:
+            cond.notify_all()
+    except RuntimeError:
+        pass  # Bound to another event loop; its waiters are not ours to wake.
+
+
+def _notify_waiters(cond: asyncio.Condition) -> None:
+    """Wake callers blocked in ``_wait_for_capacity`` on ``cond``.
+
+    ``reset()`` is synchronous and cannot take the condition's lock, so the
+    notification runs as a task on the current loop. Without a running loop
+    there is nobody waiting.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(_notify_all(cond))
+    _notify_tasks.add(task)
+    task.add_done_callback(_notify_tasks.discard)
+
 
+@runtime_checkable
+class RateLimiter(Protocol):
+    """Interface implemented by all rate limiters.
 
-class RateLimiter(ABC):
-    """Abstract base class for rate limiters."""
+    A structural protocol rather than an ABC: implementations may subclass
+    it for documentation, but any object with these methods qualifies.
+    """
+
+    __slots__ = ()
 
-    @abstractmethod
     async def acquire(self, tokens: int = 1) -> bool:
         """
         Acquire permission to proceed with an operation.
@@ -83,9 +152,23 @@ class RateLimiter(ABC):
         Returns:
             True if acquired, False if rate limited.
         """
-        pass
+        ...
+
+    async def acquire_batch(self, n: int) -> int:
+        """
+        Acquire as many of ``n`` tokens as are available now, without waiting.
+
+        Costs a single refill/cleanup however many tokens are granted, so
+        batched callers can take what is free and wait only for the rest.
+
+        Args:
+            n: Number of tokens/requests wanted.
+
+        Returns:
+            Number of tokens acquired (0 to n).
+        """
+        ...
 
-    @abstractmethod
     async def wait_and_acquire(self, tokens: int = 1) -> float:
         """
         Wait until rate limit allows and then acquire.
@@ -96,9 +179,8 @@ class RateLimiter(ABC):
         Returns:
             Time waited in seconds.
         """
-        pass
+        ...
 
-    @abstractmethod
     def get_wait_time(self, tokens: int = 1) -> float:
         """
         Get estimated wait time for acquiring tokens.
@@ -109,92 +191,217 @@ class RateLimiter(ABC):
         Returns:
             Estimated wait time in seconds, 0 if available now.
         """
-        pass
+        ...
+
+    def peek_wait_time(self, tokens: int = 1) -> float:
+        """
+        Cheap, read-only wait estimate for use right after a failed acquire.
+
+        Unlike ``get_wait_time`` this does not refill or clean up first, so
+        it may be slightly stale; use it for hints such as ``retry_after``.
+
+        Args:
+            tokens: Number of tokens/requests.
+
+        Returns:
+            Estimated wait time in seconds, 0 if available now.
+        """
+        ...
 
-    @abstractmethod
     def reset(self) -> None:
         """Reset the rate limiter state."""
-        pass
+        ...
+
+
+@dataclass(slots=True)
+class UnlimitedLimiter(RateLimiter):
+    """
+    Rate limiter that never limits.
+
+    Returned by ``from_config`` when rate limiting is disabled so the
+    permissive path skips clock reads, locking and bucket arithmetic.
+    """
+
+    async def acquire(self, tokens: int = 1) -> bool:
+        """Always acquire."""
+        return True
+
+    async def acquire_batch(self, n: int) -> int:
+        """Grant every token."""
+        return n
+
+    async def wait_and_acquire(self, tokens: int = 1) -> float:
+        """Acquire immediately."""
+        return 0.0
+
+    def get_wait_time(self, tokens: int = 1) -> float:
+        """Never any wait."""
+        return 0.0
 
+    def peek_wait_time(self, tokens: int = 1) -> float:
+        """Never any wait."""
+        return 0.0
+
+    def reset(self) -> None:
+        """Nothing to reset."""
 
-@dataclass
+
+@dataclass(slots=True)
 class TokenBucketLimiter(RateLimiter):
     """
     Token bucket rate limiter.
 
     Allows bursts up to bucket capacity, then rate limits.
     Good for APIs that allow short bursts but have per-minute limits.
+
+    Internally tokens are counted in billionths and time in integer
+    nanoseconds (``time.monotonic_ns``), so elapsed time is exact; the
+    refill multiplies it by the float ``rate`` and truncates the result
+    back to whole billionths. ``tokens`` and ``last_update`` are exposed
+    as floats. An infinite ``capacity`` is held as a finite bound too large
+    to drain.
     """
 
-    rate: float  # Tokens per second
+    rate: float  # Tokens per second (== billionths of a token per ns)
     capacity: float  # Maximum tokens (burst size)
-    tokens: float = field(init=False)
-    last_update: float = field(init=False)
-    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+    _tokens_scaled: int = field(init=False, repr=False)  # Tokens * _TOKEN_SCALE
+    _capacity_scaled: int = field(init=False, repr=False)
+    _last_update_ns: int = field(init=False, repr=False)
+    _inv_rate: float = field(init=False, repr=False)  # Seconds per token
+    _is_full: bool = field(init=False, repr=False)
+    # Only serializes blocked wait_and_acquire() callers; acquire() is lock-free.
+    _cond: asyncio.Condition = field(default_factory=asyncio.Condition, repr=False)
 
     def __post_init__(self):
-        self.tokens = self.capacity
-        self.last_update = time.monotonic()
+        if self.capacity == float("inf"):
+            self._capacity_scaled = _UNBOUNDED_SCALED
+        else:
+            self._capacity_scaled = round(self.capacity * _TOKEN_SCALE)
+        self._tokens_scaled = self._capacity_scaled
+        self._last_update_ns = time.monotonic_ns()
+        # An infinite rate refills instantly; a zero rate never refills, so
+        # the bucket is a fixed quota of ``capacity`` until reset().
+        if self.rate == float("inf"):
+            self._inv_rate = 0.0
+        elif self.rate == 0:
+            self._inv_rate = float("inf")
+        else:
+            self._inv_rate = 1.0 / self.rate
+        self._is_full = True
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently in the bucket (as of the last refill)."""
+        if self._is_full:
+            return self.capacity
+        return self._tokens_scaled / _TOKEN_SCALE
+
+    @property
+    def last_update(self) -> float:
+        """Monotonic time of the last refill, in seconds."""
+        return self._last_update_ns / _NS_PER_SECOND
 
     def _refill(self) -> None:
-        """Refill tokens based on elapsed time."""
-        now = time.monotonic()
-        elapsed = now - self.last_update
-        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
-        self.last_update = now
+        """Refill tokens based on elapsed time.
+
+        Must stay synchronous: acquire() relies on refill + check + deduct
+        running without an await so no other coroutine can interleave.
+        """
+        if self._is_full:
+            # Nothing to add. _take() restarts the clock when a token is
+            # next taken, so idle time while full earns no credit.
+            return
+        # Kept inline: the body is a handful of bytecodes, less than the
+        # cost of calling out to a compiled helper.
+        now_ns = time.monotonic_ns()
+        capacity = self._capacity_scaled
+        refilled = self._tokens_scaled + (now_ns - self._last_update_ns) * self.rate
+        # Written as "not <" so the NaN from an infinite rate times zero
+        # elapsed nanoseconds counts as full.
+        if not refilled < capacity:
+            self._tokens_scaled = capacity
+            self._is_full = True
+        else:
+            self._tokens_scaled = int(refilled)
+        self._last_update_ns = now_ns
+
+    def _take(self, tokens: int) -> None:
+        """Deduct tokens, restarting the refill clock if the bucket was full."""
+        if self._is_full:
+            # The clock went stale while full; refill from the moment of use.
+            self._last_update_ns = time.monotonic_ns()
+            self._is_full = False
+        self._tokens_scaled -= tokens * _TOKEN_SCALE
+
+    def _seconds_until(self, tokens: int) -> float:
+        """Seconds until ``tokens`` will be available, 0 if they are now."""
+        needed = tokens * _TOKEN_SCALE - self._tokens_scaled
+        if needed <= 0:
+            return 0.0
+        return needed * self._inv_rate / _TOKEN_SCALE
 
     async def acquire(self, tokens: int = 1) -> bool:
-        """Try to acquire tokens without waiting."""
-        async with self._lock:
-            self._refill()
-            if self.tokens >= tokens:
-                self.tokens -= tokens
-                return True
-            return False
+        """Try to acquire tokens without waiting.
+
+        Lock-free: the event loop is single-threaded and this body never
+        awaits, so it already runs atomically with respect to other tasks.
+        """
+        self._refill()
+        if self._tokens_scaled >= tokens * _TOKEN_SCALE:
+            self._take(tokens)
+            return True
+        return False
+
+    async def acquire_batch(self, n: int) -> int:
+        """Acquire up to ``n`` tokens with a single refill."""
+        self._refill()
+        granted = max(0, min(n, self._tokens_scaled // _TOKEN_SCALE))
+        if granted:
+            self._take(granted)
+        return granted
 
     async def wait_and_acquire(self, tokens: int = 1) -> float:
         """Wait until tokens available and acquire."""
         start_time = time.monotonic()
 
-        while True:
-            async with self._lock:
+        async with self._cond:
+            while True:
                 self._refill()
-                if self.tokens >= tokens:
-                    self.tokens -= tokens
+                if self._tokens_scaled >= tokens * _TOKEN_SCALE:
+                    self._take(tokens)
                     return time.monotonic() - start_time
 
-                # Calculate wait time
-                needed = tokens - self.tokens
-                wait_time = needed / self.rate
-
-            await asyncio.sleep(min(wait_time, 0.1))  # Check every 100ms max
+                # Sleep until enough tokens will have refilled
+                await _wait_for_capacity(self._cond, self._seconds_until(tokens))
 
     def get_wait_time(self, tokens: int = 1) -> float:
         """Get estimated wait time."""
         self._refill()
-        if self.tokens >= tokens:
-            return 0.0
-        needed = tokens - self.tokens
-        return needed / self.rate
+        return self._seconds_until(tokens)
+
+    def peek_wait_time(self, tokens: int = 1) -> float:
+        """Estimated wait as of the last refill."""
+        return self._seconds_until(tokens)
 
     def reset(self) -> None:
         """Reset to full capacity."""
-        self.tokens = self.capacity
-        self.last_update = time.monotonic()
+        self._tokens_scaled = self._capacity_scaled
+        self._last_update_ns = time.monotonic_ns()
+        self._is_full = True
+        _notify_waiters(self._cond)
 
     @classmethod
-    def from_config(cls, config: RateLimitConfig, name: str = "default") -> "TokenBucketLimiter":
+    def from_config(cls, config: RateLimitConfig, name: str = "default") -> RateLimiter:
         """Create limiter from config."""
         if not config.enabled:
-            # Return a permissive limiter
-            return cls(rate=float("inf"), capacity=float("inf"))
+            return UnlimitedLimiter()
         return cls(
             rate=config.requests_per_second,
             capacity=float(config.burst_size),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class SlidingWindowLimiter(RateLimiter):
     """
     Sliding window rate limiter.
@@ -205,79 +412,244 @@ class SlidingWindowLimiter(RateLimiter):
 
     limit: int  # Maximum requests in window
     window: float  # Window size in seconds
-    timestamps: list[float] = field(default_factory=list)
-    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+    timestamps: deque[float] = field(default_factory=deque)
+    _cond: asyncio.Condition = field(default_factory=asyncio.Condition, repr=False)
 
-    def _cleanup(self) -> None:
-        """Remove expired timestamps."""
-        now = time.monotonic()
+    def _cleanup(self, now: float) -> None:
+        """Remove timestamps that expired before ``now``.
+
+        Timestamps are appended in monotonic order, so the head of the deque
+        is always the next entry to expire: when it is still live this is a
+        single comparison, and expired entries are popped from the left.
+        """
         cutoff = now - self.window
-        self.timestamps = [ts for ts in self.timestamps if ts > cutoff]
+        timestamps = self.timestamps
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
 
     async def acquire(self, tokens: int = 1) -> bool:
         """Try to acquire without waiting."""
-        async with self._lock:
-            self._cleanup()
+        async with self._cond:
+            now = time.monotonic()
+            self._cleanup(now)
             if len(self.timestamps) + tokens <= self.limit:
-                now = time.monotonic()
-                for _ in range(tokens):
-                    self.timestamps.append(now)
+                self.timestamps.extend([now] * tokens)
                 return True
             return False
 
+    async def acquire_batch(self, n: int) -> int:
+        """Acquire up to ``n`` slots with a single cleanup."""
+        async with self._cond:
+            now = time.monotonic()
+            self._cleanup(now)
+            granted = max(0, min(n, self.limit - len(self.timestamps)))
+            self.timestamps.extend([now] * granted)
+            return granted
+
     async def wait_and_acquire(self, tokens: int = 1) -> float:
         """Wait until rate limit allows and acquire."""
         start_time = time.monotonic()
 
-        while True:
-            async with self._lock:
-                self._cleanup()
+        async with self._cond:
+            while True:
+                now = time.monotonic()
+                self._cleanup(now)
                 if len(self.timestamps) + tokens <= self.limit:
-                    now = time.monotonic()
-                    for _ in range(tokens):
-                        self.timestamps.append(now)
-                    return time.monotonic() - start_time
+                    self.timestamps.extend([now] * tokens)
+                    return now - start_time
 
-                # Calculate wait time until oldest expires
+                # Sleep until the oldest timestamp expires
                 if self.timestamps:
-                    oldest = self.timestamps[0]
-                    wait_time = (oldest + self.window) - time.monotonic()
+                    wait_time = (self.timestamps[0] + self.window) - now
                 else:
-                    wait_time = 0.1
+                    wait_time = self.window
+                await _wait_for_capacity(self._cond, max(0.0, wait_time))
 
-            await asyncio.sleep(max(0.01, min(wait_time, 0.1)))
+    def _wait_at(self, now: float, tokens: int) -> float:
+        """Seconds from ``now`` until ``tokens`` slots are free.
+
+        That is once the oldest ``len + tokens - limit`` timestamps have
+        expired, i.e. when the one at index ``len + tokens - limit - 1`` does.
+        """
+        timestamps = self.timestamps
+        excess = len(timestamps) + tokens - self.limit
+        if excess <= 0 or not timestamps:
+            return 0.0
+        # More tokens than ``limit`` never fit; report the longest wait.
+        releasing = timestamps[min(excess, len(timestamps)) - 1]
+        return max(0.0, releasing + self.window - now)
 
     def get_wait_time(self, tokens: int = 1) -> float:
         """Get estimated wait time."""
-        self._cleanup()
-        if len(self.timestamps) + tokens <= self.limit:
-            return 0.0
-        if self.timestamps:
-            oldest = self.timestamps[0]
-            return max(0, (oldest + self.window) - time.monotonic())
-        return 0.0
+        now = time.monotonic()
+        self._cleanup(now)
+        return self._wait_at(now, tokens)
+
+    def peek_wait_time(self, tokens: int = 1) -> float:
+        """Estimated wait without cleaning up expired timestamps first."""
+        return self._wait_at(time.monotonic(), tokens)
 
     def reset(self) -> None:
         """Clear all timestamps."""
         self.timestamps.clear()
+        _notify_waiters(self._cond)
 
     @classmethod
-    def from_config(cls, config: RateLimitConfig, name: str = "default") -> "SlidingWindowLimiter":
+    def from_config(cls, config: RateLimitConfig, name: str = "default") -> RateLimiter:
         """Create limiter from config."""
         if not config.enabled:
-            return cls(limit=999999, window=1.0)
+            return UnlimitedLimiter()
         return cls(
             limit=int(config.requests_per_minute),
             window=60.0,
         )
 
 
+@dataclass(slots=True)
+class SlidingWindowCounterLimiter(RateLimiter):
+    """
+    Sliding window counter rate limiter.
+
+    Approximates a sliding window with two fixed-window counters: the
+    previous window's count is weighted by how much of it still overlaps
+    the sliding window. Uses constant memory regardless of ``limit``.
+    """
+
+    limit: int  # Maximum requests in window
+    window: float  # Window size in seconds
+    current_count: int = field(default=0, init=False)
+    prev_count: int = field(default=0, init=False)
+    window_idx: int = field(default=0, init=False)
+    _cond: asyncio.Condition = field(default_factory=asyncio.Condition, repr=False)
+
+    def _advance(self, now: float) -> None:
+        """Roll the counters forward to the fixed window containing ``now``."""
+        idx = int(now // self.window)
+        if idx != self.window_idx:
+            self.prev_count = self.current_count if idx == self.window_idx + 1 else 0
+            self.current_count = 0
+            self.window_idx = idx
+
+    def _estimate(self, now: float) -> float:
+        """Estimate the number of requests in the sliding window ending at ``now``."""
+        weight = 1.0 - (now - self.window_idx * self.window) / self.window
+        return self.prev_count * weight + self.current_count
+
+    def _try_acquire(self, tokens: int) -> bool:
+        now = time.monotonic()
+        self._advance(now)
+        if self._estimate(now) + tokens <= self.limit:
+            self.current_count += tokens
+            return True
+        return False
+
+    async def acquire(self, tokens: int = 1) -> bool:
+        """Try to acquire without waiting."""
+        async with self._cond:
+            return self._try_acquire(tokens)
+
+    async def acquire_batch(self, n: int) -> int:
+        """Acquire up to ``n`` slots with a single window roll-forward."""
+        async with self._cond:
+            now = time.monotonic()
+            self._advance(now)
+            granted = max(0, min(n, int(self.limit - self._estimate(now))))
+            self.current_count += granted
+            return granted
+
+    async def wait_and_acquire(self, tokens: int = 1) -> float:
+        """Wait until rate limit allows and acquire."""
+        start_time = time.monotonic()
+
+        async with self._cond:
+            while not self._try_acquire(tokens):
+                await _wait_for_capacity(self._cond, self.get_wait_time(tokens))
+            return time.monotonic() - start_time
+
+    def get_wait_time(self, tokens: int = 1) -> float:
+        """Get estimated wait time."""
+        now = time.monotonic()
+        self._advance(now)
+        if self._estimate(now) + tokens <= self.limit:
+            return 0.0
+
+        window_start = self.window_idx * self.window
+        room = self.limit - self.current_count - tokens
+        if room >= 0 and self.prev_count:
+            # Wait for the previous window's weight to decay far enough.
+            ready_at = window_start + self.window * (1.0 - room / self.prev_count)
+        else:
+            # Current window is full: wait for it to become the previous one.
+            ready_at = window_start + self.window
+            room = self.limit - tokens
+            if self.current_count > room >= 0:
+                ready_at += self.window * (1.0 - room / self.current_count)
+        return max(0.0, ready_at - now)
+
+    def peek_wait_time(self, tokens: int = 1) -> float:
+        """Same as ``get_wait_time``; the counters are already O(1) to read."""
+        return self.get_wait_time(tokens)
+
+    def reset(self) -> None:
+        """Clear both window counters."""
+        self.current_count = 0
+        self.prev_count = 0
+        _notify_waiters(self._cond)
+
+    @classmethod
+    def from_config(cls, config: RateLimitConfig, name: str = "default") -> RateLimiter:
+        """Create limiter from config."""
+        if not config.enabled:
+            return UnlimitedLimiter()
+        return cls(
+            limit=int(config.requests_per_minute),
+            window=60.0,
+        )
+
+
+# Number of striped creation locks in RateLimiterRegistry (a power of two).
+_LOCK_STRIPES = 64
+
+
 class RateLimiterRegistry:
-    """Registry for managing multiple rate limiters."""
+    """Registry for managing multiple rate limiters.
+
+    By default every limiter is kept for the life of the registry, which is
+    what named, shared limiters need: callers such as ``ShellTool`` hold on
+    to the instance, and usage of a held limiter is invisible here.
+
+    Registries keyed per user or per API key can opt into eviction. With
+    ``max_size`` the least recently looked-up entry is dropped once the
+    registry grows past it; with ``idle_ttl`` entries not looked up for
+    that many seconds are dropped whenever a new limiter is registered.
+    Entries there must be fetched through ``get_or_create`` on each use so
+    that a recreated limiter is the only one in play.
+    """
 
-    def __init__(self):
-        self._limiters: dict[str, RateLimiter] = {}
+    def __init__(self, max_size: int | None = None, idle_ttl: float | None = None):
+        self._max_size = max_size
+        self._idle_ttl = idle_ttl
+        self._limiters: OrderedDict[str, RateLimiter] = OrderedDict()
         self._configs: dict[str, RateLimitConfig] = {}
+        self._last_used: dict[str, float] = {}
+        self._generation = 0
+        # Striped by name so creating unrelated limiters never contends.
+        self._creation_locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped whenever a limiter is removed or replaced.
+
+        Callers that cache a limiter can compare it to tell whether their
+        copy may no longer be the registry's.
+        """
+        return self._generation
+
+    def _evict(self, name: str) -> None:
+        self._generation += 1
+        self._limiters.pop(name, None)
+        self._configs.pop(name, None)
+        self._last_used.pop(name, None)
 
     def register(
         self,
@@ -291,19 +663,33 @@ class RateLimiterRegistry:
         Args:
             name: Unique identifier for the limiter.
             config: Rate limit configuration.
-            limiter_type: "token_bucket" or "sliding_window".
+            limiter_type: "token_bucket", "sliding_window", or
+                "sliding_window_counter" (strict per-minute limits in
+                constant memory).
 
         Returns:
             The created rate limiter.
         """
+        if name in self._limiters:
+            self._generation += 1
         self._configs[name] = config
 
         if limiter_type == "sliding_window":
             limiter = SlidingWindowLimiter.from_config(config, name)
+        elif limiter_type == "sliding_window_counter":
+            limiter = SlidingWindowCounterLimiter.from_config(config, name)
         else:
             limiter = TokenBucketLimiter.from_config(config, name)
 
         self._limiters[name] = limiter
+        self._limiters.move_to_end(name)
+        self._last_used[name] = time.monotonic()
+        self.evict_idle()
+        if self._max_size is not None:
+            while len(self._limiters) > self._max_size:
+                evicted = next(iter(self._limiters))
+                self._evict(evicted)
+                logger.debug(f"Evicted rate limiter: {evicted}")
         logger.debug(f"Registered rate limiter: {name} ({limiter_type})")
         return limiter
 
@@ -317,11 +703,46 @@ class RateLimiterRegistry:
         config: RateLimitConfig | None = None,
     ) -> RateLimiter:
         """Get existing or create new rate limiter."""
-        if name in self._limiters:
-            return self._limiters[name]
+        limiter = self._limiters.get(name)
+        if limiter is not None:
+            try:
+                self._limiters.move_to_end(name)
+                self._last_used[name] = time.monotonic()
+            except KeyError:
+                pass  # Evicted concurrently; the caller still gets a usable limiter
+            return limiter
+
+        with self._creation_locks[hash(name) & (_LOCK_STRIPES - 1)]:
+            # Re-check: another thread may have created it while we waited.
+            limiter = self._limiters.get(name)
+            if limiter is not None:
+                return limiter
+            return self.register(name, config or RateLimitConfig())
+
+    def evict_idle(self) -> int:
+        """
+        Drop limiters that have not been used for ``idle_ttl`` seconds.
+
+        Limiters are in least-recently-used order, so this only inspects
+        entries from the front until it reaches one still in use. Does
+        nothing unless the registry was created with an ``idle_ttl``.
 
-        config = config or RateLimitConfig()
-        return self.register(name, config)
+        Returns:
+            Number of limiters evicted.
+        """
+        if self._idle_ttl is None:
+            return 0
+        cutoff = time.monotonic() - self._idle_ttl
+        evicted = 0
+        while self._limiters:
+            name = next(iter(self._limiters))
+            if self._last_used.get(name, cutoff) > cutoff:
+                break
+            self._evict(name)
+            evicted += 1
+        if evicted:
+            logger.debug(f"Evicted {evicted} idle rate limiter(s)")
+        return evicted
 
     def reset_all(self) -> None:
         """Reset all rate limiters."""
@@ -331,9 +752,7 @@ class RateLimiterRegistry:
     def remove(self, name: str) -> bool:
         """Remove a rate limiter."""
         if name in self._limiters:
-            del self._limiters[name]
-            if name in self._configs:
-                del self._configs[name]
+            self._evict(name)
             return True
         return False
 
@@ -378,25 +797,43 @@ def rate_limited(
             ...
     """
     def decorator(func: Callable) -> Callable:
-        async def wrapper(*args: Any, **kwargs: Any) -> Any:
-            limiter = get_rate_limiter(limiter_name, config)
-
-            if wait:
+        # The limiter is cached and only looked up again once the registry
+        # has removed or replaced an entry (its generation moved on), so the
+        # wrapper never keeps acquiring from a limiter the registry dropped.
+        # The wrapper itself is picked once so calls do not branch on ``wait``.
+        limiter: RateLimiter | None = None
+        registry: RateLimiterRegistry | None = None
+        generation = 0
+
+        def resolve() -> RateLimiter:
+            nonlocal limiter, registry, generation
+            current = _global_registry
+            if limiter is None or current is not registry or current.generation != generation:
+                registry = current
+                generation = current.generation
+                limiter = get_rate_limiter(limiter_name, config)
+            return limiter
+
+        if wait:
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                limiter = resolve()
                 wait_time = await limiter.wait_and_acquire()
                 if wait_time > 0.1:
                     logger.debug(f"Rate limited {limiter_name}: waited {wait_time:.2f}s")
-            else:
-                acquired = await limiter.acquire()
-                if not acquired:
-                    from spoon_bot.utils.errors import RateLimitExceeded
+                return await func(*args, **kwargs)
+        else:
+            limit = config.requests_per_minute if config else 60
+
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                limiter = resolve()
+                if not await limiter.acquire():
                     raise RateLimitExceeded(
                         resource=limiter_name,
-                        limit=config.requests_per_minute if config else 60,
+                        limit=limit,
                         window=60.0,
-                        retry_after=limiter.get_wait_time(),
+                        retry_after=limiter.peek_wait_time(),
                     )
-
-            return await func(*args, **kwargs)
+                return await func(*args, **kwargs)
 
         wrapper.__name__ = func.__name__
         wrapper.__doc__ = func.__doc__
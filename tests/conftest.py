@@ -4,11 +4,37 @@ from __future__ import annotations
 
 import importlib
 import os
+import shutil
+import tempfile
 from pathlib import Path
 
 import pytest
 
 
+# Don't use /dev/shm when it is a small container default (64 MB).
+_MIN_SHM_FREE_BYTES = 512 * 1024 * 1024
+
+
+def _fast_tmp_root() -> str | None:
+    """Pick a RAM-backed root for filesystem-test directories, if usable.
+
+    ``SPOON_TEST_TMPDIR`` overrides the choice; otherwise ``/dev/shm`` is used
+    when it is writable and has room, so filesystem tests skip disk I/O.
+    """
+    override = os.environ.get("SPOON_TEST_TMPDIR")
+    if override:
+        return override
+    shm = "/dev/shm"
+    if not (os.path.isdir(shm) and os.access(shm, os.W_OK)):
+        return None
+    try:
+        if shutil.disk_usage(shm).free < _MIN_SHM_FREE_BYTES:
+            return None
+    except OSError:
+        return None
+    return shm
+
+
 def pytest_configure(config):
     """Configure pytest markers."""
     config.addinivalue_line(
@@ -50,6 +76,21 @@ def pytest_collection_modifyitems(config, items):
                 item.add_marker(skip_api_key)
 
 
+@pytest.fixture(scope="session")
+def fast_tmp_root(tmp_path_factory) -> Path:
+    """Per-run directory on RAM-backed storage for I/O-heavy filesystem tests.
+
+    Falls back to pytest's own temp directory when no fast root is usable.
+    The directory is unique to this run and removed when the session ends.
+    """
+    root = _fast_tmp_root()
+    if root is None:
+        yield tmp_path_factory.mktemp("spoon_fs")
+        return
+    with tempfile.TemporaryDirectory(prefix="spoon_fs", dir=root) as path:
+        yield Path(path)
+
+
 @pytest.fixture
 def workspace_dir(tmp_path: Path) -> Path:
     """Provide a temporary workspace directory for tests."""
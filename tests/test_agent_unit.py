@@ -12,7 +12,8 @@ import json
 import statistics
 import time
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import pytest
 
@@ -25,14 +26,11 @@ from spoon_bot.agent.loop import AgentLoop
 
 # -- helpers --
 
-def _make_mock_tool(name: str, description: str) -> MagicMock:
-    tool = MagicMock()
-    tool.name = name
-    tool.description = description
-    return tool
+def _make_mock_tool(name: str, description: str) -> SimpleNamespace:
+    return SimpleNamespace(name=name, description=description)
 
 
-def _inactive_tools_from_names(nd: dict[str, str]) -> dict[str, MagicMock]:
+def _inactive_tools_from_names(nd: dict[str, str]) -> dict[str, SimpleNamespace]:
     return {n: _make_mock_tool(n, d) for n, d in nd.items()}
 
 
@@ -8,8 +8,9 @@ Validates that:
 
 from __future__ import annotations
 
+from types import SimpleNamespace
+
 import pytest
-from unittest.mock import MagicMock
 
 from spoon_bot.agent.loop import AgentLoop
 
@@ -18,15 +19,12 @@ from spoon_bot.agent.loop import AgentLoop
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _make_mock_tool(name: str, description: str) -> MagicMock:
-    """Create a mock Tool with name and description properties."""
-    tool = MagicMock()
-    tool.name = name
-    tool.description = description
-    return tool
+def _make_mock_tool(name: str, description: str) -> SimpleNamespace:
+    """Create a stand-in Tool with just the name and description the prompt reads."""
+    return SimpleNamespace(name=name, description=description)
 
 
-def _inactive_tools_from_names(names_descs: dict[str, str]) -> dict[str, MagicMock]:
+def _inactive_tools_from_names(names_descs: dict[str, str]) -> dict[str, SimpleNamespace]:
     """Build an {name: MockTool} dict from {name: description} mapping."""
     return {n: _make_mock_tool(n, d) for n, d in names_descs.items()}
 
@@ -1,10 +1,21 @@
 from __future__ import annotations
 
 import json
-from unittest.mock import AsyncMock, MagicMock
-
+from collections.abc import AsyncIterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+import spoon_bot.gateway.app as app_module
+from spoon_bot.gateway.app import create_app
+from spoon_bot.gateway.config import GatewayConfig
+from spoon_bot.runtime.session_registry import SessionRuntimeRegistry
+
 
 SUBAGENT_SOURCE = {
     "type": "subagent",
@@ -13,28 +24,76 @@ SUBAGENT_SOURCE = {
     "subagent_name": "research-subagent",
 }
 
+# Chat request bodies, encoded once for every request that sends them.
+_HELLO_BODY = json.dumps({"message": "hello"}).encode()
+_HELLO_STREAM_BODY = json.dumps({"message": "hello", "options": {"stream": True}}).encode()
+_JSON_HEADERS = {"content-type": "application/json"}
 
-def _base_mock_agent() -> MagicMock:
-    agent = MagicMock()
-    agent.sessions = MagicMock()
-    agent.tools = MagicMock()
-    agent.tools.list_tools = MagicMock(return_value=[])
-    agent.skills = []
-    agent.get_last_response_source = MagicMock(return_value=dict(SUBAGENT_SOURCE))
-    return agent
+_SSE_DATA_PREFIX = "data: "
+_SSE_DONE_LINE = _SSE_DATA_PREFIX + "[DONE]"
+
+
+@dataclass
+class _SubagentAgentStub:
+    """Gateway agent whose last response is attributed to a subagent."""
+
+    process: AsyncMock = field(default_factory=AsyncMock)
+    stream: Any = None
+
+    def get_last_response_source(self) -> dict[str, Any]:
+        return dict(SUBAGENT_SOURCE)
+
+
+def _subagent_stream(text: str):
+    """Return an ``agent.stream`` stand-in that emits ``text`` from the subagent."""
+
+    async def mock_stream(**kwargs):
+        yield {
+            "type": "content",
+            "delta": text,
+            "metadata": {},
+            "source": dict(SUBAGENT_SOURCE),
+        }
+        yield {
+            "type": "done",
+            "delta": "",
+            "metadata": {"content": text},
+            "source": dict(SUBAGENT_SOURCE),
+        }
+
+    return mock_stream
+
+
+@pytest.fixture(scope="module")
+def app() -> FastAPI:
+    """One gateway app shared by every test in this module."""
+    return create_app(GatewayConfig.from_env())
 
 
-def _create_test_app(mock_agent: MagicMock):
-    from spoon_bot.gateway.app import create_app, set_agent
-    from spoon_bot.gateway.config import GatewayConfig
-    from spoon_bot.gateway.websocket.manager import ConnectionManager
-    import spoon_bot.gateway.app as app_module
+@pytest.fixture(scope="module")
+def client(app: FastAPI) -> Iterator[TestClient]:
+    """Synchronous client for the WebSocket tests.
 
-    app_module._auth_required = False
-    app = create_app(GatewayConfig.from_env())
-    set_agent(mock_agent)
-    app_module._connection_manager = ConnectionManager()
-    return app
+    Entered once so its event-loop thread and the app lifespan are shared by
+    the whole module instead of being started per request.
+    """
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def mock_agent(app: FastAPI, monkeypatch: pytest.MonkeyPatch) -> _SubagentAgentStub:
+    """Install a fresh mock agent, with auth off, for one test.
+
+    The gateway globals are restored afterwards so the shared app carries no
+    state between tests. The WebSocket connection manager comes from the
+    ``client`` lifespan.
+    """
+    agent = _SubagentAgentStub()
+    monkeypatch.setattr(app_module, "_auth_required", False)
+    monkeypatch.setattr(app_module, "_agent", agent)
+    monkeypatch.setattr(app_module, "_session_runtime_registry", SessionRuntimeRegistry(agent))
+    return agent
 
 
 def _collect_ws_messages(ws, request_id: str) -> list[dict]:
@@ -46,64 +105,65 @@ def _collect_ws_messages(ws, request_id: str) -> list[dict]:
             return messages
 
 
-class TestHTTPSubagentSource:
-    def test_non_streaming_chat_returns_subagent_source(self):
-        mock_agent = _base_mock_agent()
-        mock_agent.process = AsyncMock(return_value="hello from subagent")
+async def _parse_sse_data(lines: AsyncIterable[str]) -> tuple[list[dict], bool]:
+    """Decode the JSON ``data:`` lines of an SSE stream.
 
-        client = TestClient(_create_test_app(mock_agent))
-        response = client.post("/v1/agent/chat", json={"message": "hello"})
+    Returns the decoded events and whether the ``[DONE]`` terminator was
+    seen. Lines are consumed as the response yields them and anything that
+    is not a data line is dropped immediately.
+    """
+    events: list[dict] = []
+    saw_done = False
+    async for line in lines:
+        if not line.startswith(_SSE_DATA_PREFIX):
+            continue
+        if line == _SSE_DONE_LINE:
+            saw_done = True
+        else:
+            events.append(json.loads(line[len(_SSE_DATA_PREFIX):]))
+    return events, saw_done
 
-        assert response.status_code == 200
-        body = response.json()
-        assert body["data"]["source"] == SUBAGENT_SOURCE
 
-    def test_streaming_chat_returns_subagent_source_in_chunks(self):
-        mock_agent = _base_mock_agent()
-
-        async def mock_stream(**kwargs):
-            yield {
-                "type": "content",
-                "delta": "chunk from subagent",
-                "metadata": {},
-                "source": dict(SUBAGENT_SOURCE),
-            }
-            yield {
-                "type": "done",
-                "delta": "",
-                "metadata": {"content": "chunk from subagent"},
-                "source": dict(SUBAGENT_SOURCE),
-            }
-
-        mock_agent.stream = mock_stream
-
-        client = TestClient(_create_test_app(mock_agent))
-        response = client.post(
-            "/v1/agent/chat",
-            json={"message": "hello", "options": {"stream": True}},
-        )
+class TestHTTPSubagentSource:
+    @pytest.mark.asyncio
+    async def test_non_streaming_chat_returns_subagent_source(self, app, mock_agent):
+        mock_agent.process.return_value = "hello from subagent"
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as ac:
+            response = await ac.post(
+                "/v1/agent/chat", content=_HELLO_BODY, headers=_JSON_HEADERS,
+            )
 
         assert response.status_code == 200
-        events = []
-        for block in response.text.strip().split("\n\n"):
-            if not block.startswith("data: "):
-                continue
-            payload = block[6:]
-            if payload == "[DONE]":
-                continue
-            events.append(json.loads(payload))
+        body = response.json()
+        assert body["data"]["source"] == SUBAGENT_SOURCE
 
+    @pytest.mark.asyncio
+    async def test_streaming_chat_returns_subagent_source_in_chunks(self, app, mock_agent):
+        mock_agent.stream = _subagent_stream("chunk from subagent")
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as ac:
+            async with ac.stream(
+                "POST",
+                "/v1/agent/chat",
+                content=_HELLO_STREAM_BODY,
+                headers=_JSON_HEADERS,
+            ) as response:
+                assert response.status_code == 200
+                events, saw_done = await _parse_sse_data(response.aiter_lines())
+
+        assert saw_done
         content_events = [event for event in events if event.get("type") == "content"]
         assert content_events
         assert content_events[0]["source"] == SUBAGENT_SOURCE
 
 
 class TestWSSubagentSource:
-    def test_non_streaming_ws_returns_subagent_source(self):
-        mock_agent = _base_mock_agent()
-        mock_agent.process = AsyncMock(return_value="ws subagent response")
+    def test_non_streaming_ws_returns_subagent_source(self, client, mock_agent):
+        mock_agent.process.return_value = "ws subagent response"
 
-        client = TestClient(_create_test_app(mock_agent))
         with client.websocket_connect("/v1/ws") as ws:
             ws.receive_json()
             ws.send_json(
@@ -127,26 +187,9 @@ class TestWSSubagentSource:
         response = messages[-1]
         assert response["result"]["source"] == SUBAGENT_SOURCE
 
-    def test_streaming_ws_returns_subagent_source(self):
-        mock_agent = _base_mock_agent()
-
-        async def mock_stream(**kwargs):
-            yield {
-                "type": "content",
-                "delta": "stream chunk",
-                "metadata": {},
-                "source": dict(SUBAGENT_SOURCE),
-            }
-            yield {
-                "type": "done",
-                "delta": "",
-                "metadata": {"content": "stream chunk"},
-                "source": dict(SUBAGENT_SOURCE),
-            }
-
-        mock_agent.stream = mock_stream
-
-        client = TestClient(_create_test_app(mock_agent))
+    def test_streaming_ws_returns_subagent_source(self, client, mock_agent):
+        mock_agent.stream = _subagent_stream("stream chunk")
+
         with client.websocket_connect("/v1/ws") as ws:
             ws.receive_json()
             ws.send_json(
@@ -20,6 +20,8 @@ NOTE: Some of these tests depend on tracing / budget features that are still
 from __future__ import annotations
 
 import asyncio
+import contextvars
+import functools
 import json
 import time
 from datetime import datetime
@@ -27,6 +29,19 @@ from unittest.mock import AsyncMock, MagicMock, patch, PropertyMock
 
 import pytest
 
+from spoon_bot.gateway.errors import (
+    GatewayErrorCode,
+    TimeoutCode,
+    build_error_response,
+    build_timeout_error_detail,
+)
+from spoon_bot.gateway.models.responses import (
+    APIResponse,
+    ErrorDetail,
+    ErrorResponse,
+    MetaInfo,
+    StreamChunk,
+)
 from spoon_bot.gateway.observability.tracing import (
     new_trace_id,
     now_ms,
@@ -34,6 +49,34 @@ from spoon_bot.gateway.observability.tracing import (
     build_timing_payload,
 )
 
+from spoon_bot.runtime.session_registry import SessionRuntimeRegistry
+
+
+@pytest.fixture(autouse=True)
+def _runtimes_follow_patched_agent(monkeypatch):
+    """Serve session runtimes from the agent each test patches in as ``get_agent``.
+
+    Chat handlers take their agent from the session runtime registry, which
+    otherwise falls back to whatever agent an earlier test module installed.
+    """
+    import spoon_bot.gateway.api.v1.agent as agent_api
+    import spoon_bot.gateway.websocket.handler as ws_handler
+
+    registries: dict[int, SessionRuntimeRegistry] = {}
+
+    def _registry_for(module):
+        def _get_registry() -> SessionRuntimeRegistry:
+            agent = module.get_agent()
+            registry = registries.get(id(agent))
+            if registry is None:
+                registry = registries[id(agent)] = SessionRuntimeRegistry(agent)
+            return registry
+
+        return _get_registry
+
+    monkeypatch.setattr(agent_api, "get_session_runtime_registry", _registry_for(agent_api))
+    monkeypatch.setattr(ws_handler, "get_session_runtime_registry", _registry_for(ws_handler))
+
 
 # ============================================================================
 # §1  Tracing utilities  (was test_gateway_tracing_utils.py)
@@ -138,40 +181,32 @@ class TestBuildTimingPayload:
 
 class TestMetaInfoTracing:
     def test_trace_id_optional_default_none(self):
-        from spoon_bot.gateway.models.responses import MetaInfo
         assert MetaInfo(request_id="r").trace_id is None
 
     def test_trace_id_set(self):
-        from spoon_bot.gateway.models.responses import MetaInfo
         assert MetaInfo(request_id="r", trace_id="trc_abc").trace_id == "trc_abc"
 
     def test_timing_optional_default_none(self):
-        from spoon_bot.gateway.models.responses import MetaInfo
         assert MetaInfo(request_id="r").timing is None
 
     def test_timing_set(self):
-        from spoon_bot.gateway.models.responses import MetaInfo
         m = MetaInfo(request_id="r", timing={"total_elapsed_ms": 150, "started_at": "2024-01-01T00:00:00Z"})
         assert m.timing["total_elapsed_ms"] == 150
 
     def test_backward_compatible(self):
-        from spoon_bot.gateway.models.responses import MetaInfo
         m = MetaInfo(request_id="r", duration_ms=100)
         assert m.duration_ms == 100 and m.trace_id is None and m.timing is None
 
     def test_serialization_includes_trace(self):
-        from spoon_bot.gateway.models.responses import MetaInfo
         d = MetaInfo(request_id="r", trace_id="trc_x", timing={"total_elapsed_ms": 50}).model_dump()
         assert d["trace_id"] == "trc_x"
         assert d["timing"]["total_elapsed_ms"] == 50
 
     def test_api_response_with_trace_meta(self):
-        from spoon_bot.gateway.models.responses import MetaInfo, APIResponse
         meta = MetaInfo(request_id="r", trace_id="trc_test", timing={"total_elapsed_ms": 200})
         assert APIResponse(success=True, data={"msg": "ok"}, meta=meta).meta.trace_id == "trc_test"
 
     def test_error_response_with_trace_meta(self):
-        from spoon_bot.gateway.models.responses import MetaInfo, ErrorResponse, ErrorDetail
         meta = MetaInfo(request_id="r", trace_id="trc_err")
         err = ErrorResponse(error=ErrorDetail(code="TEST", message="test error"), meta=meta)
         assert err.meta.trace_id == "trc_err"
@@ -184,32 +219,26 @@ class TestMetaInfoTracing:
 
 class TestTimeoutErrorCodeStandardization:
     def test_timeout_upstream_code(self):
-        from spoon_bot.gateway.errors import TimeoutCode
         assert TimeoutCode.TIMEOUT_UPSTREAM == "TIMEOUT_UPSTREAM"
 
     def test_timeout_tool_code(self):
-        from spoon_bot.gateway.errors import TimeoutCode
         assert TimeoutCode.TIMEOUT_TOOL == "TIMEOUT_TOOL"
 
     def test_timeout_total_code(self):
-        from spoon_bot.gateway.errors import TimeoutCode
         assert TimeoutCode.TIMEOUT_TOTAL == "TIMEOUT_TOTAL"
 
     def test_build_timeout_upstream_detail(self):
-        from spoon_bot.gateway.errors import build_timeout_error_detail
         d = build_timeout_error_detail("TIMEOUT_UPSTREAM", elapsed_ms=5000, limit_ms=3000)
         assert d.code == "TIMEOUT_UPSTREAM"
         assert d.details["elapsed_ms"] == 5000
         assert d.details["limit_ms"] == 3000
 
     def test_build_timeout_tool_detail_context(self):
-        from spoon_bot.gateway.errors import build_timeout_error_detail
         d = build_timeout_error_detail("TIMEOUT_TOOL", elapsed_ms=15000, limit_ms=10000, context="shell")
         assert d.code == "TIMEOUT_TOOL"
         assert d.details["context"] == "shell"
 
     def test_build_timeout_total_detail(self):
-        from spoon_bot.gateway.errors import build_timeout_error_detail
         d = build_timeout_error_detail("TIMEOUT_TOTAL", elapsed_ms=120000, limit_ms=120000)
         assert d.code == "TIMEOUT_TOTAL"
 
@@ -221,8 +250,6 @@ class TestTimeoutErrorCodeStandardization:
 
 class TestSmartFallback:
     def test_error_response_includes_trace_id(self):
-        from spoon_bot.gateway.errors import build_error_response
-        from spoon_bot.gateway.models.responses import ErrorDetail
         resp = build_error_response(
             ErrorDetail(code="TEST_ERROR", message="test"),
             request_id="req_123", trace_id="trc_abc",
@@ -231,8 +258,6 @@ class TestSmartFallback:
         assert resp.meta.request_id == "req_123"
 
     def test_error_response_includes_timing(self):
-        from spoon_bot.gateway.errors import build_error_response
-        from spoon_bot.gateway.models.responses import ErrorDetail
         resp = build_error_response(
             ErrorDetail(code="TEST_ERROR", message="test"),
             request_id="req_123", timing={"total_elapsed_ms": 500},
@@ -240,7 +265,6 @@ class TestSmartFallback:
         assert resp.meta.timing["total_elapsed_ms"] == 500
 
     def test_timeout_error_response_full(self):
-        from spoon_bot.gateway.errors import TimeoutCode, build_timeout_error_detail, build_error_response
         ed = build_timeout_error_detail(TimeoutCode.TIMEOUT_UPSTREAM, elapsed_ms=5000, limit_ms=3000)
         resp = build_error_response(
             ed, request_id="req_456", trace_id="trc_def",
@@ -251,7 +275,6 @@ class TestSmartFallback:
         assert resp.meta.trace_id == "trc_def"
 
     def test_all_gateway_error_codes_defined(self):
-        from spoon_bot.gateway.errors import GatewayErrorCode
         codes = [e.value for e in GatewayErrorCode]
         for c in ("TIMEOUT_UPSTREAM", "TIMEOUT_TOOL", "TIMEOUT_TOTAL", "BUDGET_EXHAUSTED", "CANCELLED"):
             assert c in codes
@@ -975,7 +998,9 @@ class TestWsTraceIdUniqueness:
 # ============================================================================
 
 
+@functools.lru_cache(maxsize=1)
 def _create_rest_test_app():
+    """Build the REST test app once; tests swap the agent by patching ``get_agent``."""
     from fastapi import FastAPI
     from spoon_bot.gateway.api.v1.agent import router
     app = FastAPI()
@@ -1070,6 +1095,53 @@ class TestChatSseTraceAndTiming:
         assert "fallback from done metadata" in resp.text
 
 
+class TestSseFrameFormat:
+    def test_chunk_frame_is_model_json_bytes(self):
+        from spoon_bot.gateway.api.v1.agent import _format_sse_chunk
+
+        chunk = StreamChunk(type="content", delta='caf\u00e9 "quoted"\n', metadata={"n": 1})
+        frame = _format_sse_chunk(chunk)
+        assert isinstance(frame, bytes)
+        assert frame == f"data: {chunk.model_dump_json()}\n\n".encode()
+
+    def test_stream_event_chunk_matches_validated_model(self):
+        from pydantic import ValidationError
+        from spoon_bot.gateway.api.v1.agent import _stream_event_chunk
+
+        event = {"type": "content", "delta": "hi", "metadata": {"step": 1},
+                 "source": {"type": "subagent", "is_subagent": True}}
+        chunk = _stream_event_chunk("content", event)
+        assert chunk == StreamChunk.model_validate(event)
+        assert chunk.model_dump_json() == StreamChunk.model_validate(event).model_dump_json()
+
+        with pytest.raises(ValidationError):
+            _stream_event_chunk("content", {"delta": None})
+
+    def test_stream_event_chunk_reuses_source_model(self):
+        from spoon_bot.gateway.api.v1.agent import _stream_event_chunk
+
+        source = {"type": "agent", "is_subagent": False, "subagent_id": None, "subagent_name": None}
+        first = _stream_event_chunk("content", {"delta": "a", "source": dict(source)})
+        second = _stream_event_chunk("content", {"delta": "b", "source": dict(source)})
+        other = _stream_event_chunk(
+            "content", {"delta": "c", "source": {**source, "type": "subagent", "is_subagent": True}},
+        )
+        assert first.source is second.source
+        assert other.source is not first.source
+        assert other.source.is_subagent is True
+
+    def test_done_frame_is_preencoded(self):
+        from spoon_bot.gateway.api.v1.agent import _SSE_DONE
+
+        assert _SSE_DONE == b"data: [DONE]\n\n"
+
+    def test_event_frame_keeps_non_ascii(self):
+        from spoon_bot.gateway.api.v1.agent import _format_sse_event
+
+        frame = _format_sse_event("trace", {"note": "caf\u00e9"})
+        assert frame == 'event: trace\ndata: {"note": "caf\u00e9"}\n\n'.encode()
+
+
 class TestRestTimeoutErrorCodes:
     def test_upstream_timeout_returns_error(self):
         from fastapi.testclient import TestClient
@@ -1125,10 +1197,148 @@ class TestRestCancellation:
             cancel_event=cancel_event,
         ):
             chunks_yielded.append(chunk)
-        content_chunks = [c for c in chunks_yielded if "content" in c and "chunk" in c]
+        content_chunks = [c for c in chunks_yielded if b"content" in c and b"chunk" in c]
         assert len(content_chunks) < 10
 
 
+class TestSseContentCoalescing:
+    @staticmethod
+    async def _collect(events, window=0.05):
+        from spoon_bot.gateway.api.v1.agent import _coalesce_content_events
+
+        return [event async for event in _coalesce_content_events(events, window)]
+
+    @pytest.mark.asyncio
+    async def test_burst_of_content_tokens_shares_one_event(self):
+        async def burst():
+            yield {"type": "content", "delta": "He", "metadata": {"segment_start": True}}
+            yield {"type": "content", "delta": "llo", "metadata": {}}
+            yield {"type": "done", "delta": "", "metadata": {"content": "Hello"}}
+
+        events = await self._collect(burst())
+        assert [(e["type"], e["delta"]) for e in events] == [("content", "Hello"), ("done", "")]
+        assert events[0]["metadata"] == {"segment_start": True}
+
+    @pytest.mark.asyncio
+    async def test_slow_tokens_and_segment_breaks_stay_separate(self):
+        async def spaced():
+            yield {"type": "content", "delta": "a", "metadata": {}}
+            await asyncio.sleep(0.2)
+            yield {"type": "content", "delta": "b", "metadata": {}}
+            yield {"type": "tool_call", "delta": "", "metadata": {"name": "shell"}}
+            yield {"type": "content", "delta": "c", "metadata": {"segment_start": True}}
+
+        events = await self._collect(spaced())
+        assert [(e["type"], e["delta"]) for e in events] == [
+            ("content", "a"), ("content", "b"), ("tool_call", ""), ("content", "c"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_steady_sub_window_stream_is_still_streamed(self):
+        async def steady():
+            for _ in range(40):
+                yield {"type": "content", "delta": "x", "metadata": {}}
+                await asyncio.sleep(0.005)
+
+        # Every gap is shorter than the window, yet frames keep flowing.
+        events = await self._collect(steady(), window=0.02)
+        assert len(events) > 1
+        assert "".join(e["delta"] for e in events) == "x" * 40
+
+    @pytest.mark.asyncio
+    async def test_merged_delta_is_capped(self):
+        from spoon_bot.gateway.api.v1.agent import _coalesce_content_events
+
+        async def burst():
+            for _ in range(10):
+                yield {"type": "content", "delta": "abc", "metadata": {}}
+
+        events = [e async for e in _coalesce_content_events(burst(), 10.0, max_chars=9)]
+        assert [e["delta"] for e in events] == ["abc" * 3] * 3 + ["abc"]
+
+    @pytest.mark.asyncio
+    async def test_upstream_cancelled_error_is_forwarded(self):
+        async def cancelled():
+            yield {"type": "content", "delta": "partial", "metadata": {}}
+            raise asyncio.CancelledError()
+
+        from spoon_bot.gateway.api.v1.agent import _coalesce_content_events
+
+        seen = []
+
+        async def consume():
+            async for event in _coalesce_content_events(cancelled(), 0.05):
+                seen.append(event["delta"])
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(consume(), timeout=1.0)
+        assert seen == ["partial"]
+
+    @pytest.mark.asyncio
+    async def test_held_content_is_flushed_before_upstream_error(self):
+        async def failing():
+            yield {"type": "content", "delta": "partial", "metadata": {}}
+            raise RuntimeError("upstream failed")
+
+        from spoon_bot.gateway.api.v1.agent import _coalesce_content_events
+
+        seen = []
+        with pytest.raises(RuntimeError):
+            async for event in _coalesce_content_events(failing(), 0.05):
+                seen.append(event["delta"])
+        assert seen == ["partial"]
+
+    @pytest.mark.asyncio
+    async def test_closing_early_closes_upstream(self):
+        from spoon_bot.gateway.api.v1.agent import _coalesce_content_events
+
+        closed = asyncio.Event()
+
+        async def endless():
+            try:
+                while True:
+                    yield {"type": "content", "delta": "x", "metadata": {}}
+                    await asyncio.sleep(0.2)
+            finally:
+                closed.set()
+
+        stream = _coalesce_content_events(endless(), 0.01)
+        assert (await anext(stream))["delta"] == "x"
+        await stream.aclose()
+        assert closed.is_set()
+
+    @pytest.mark.asyncio
+    async def test_context_variables_survive_across_upstream_yields(self):
+        from spoon_bot.gateway.api.v1.agent import _coalesce_content_events
+
+        current = contextvars.ContextVar("current", default=None)
+        seen_after_yield = []
+        reset_errors = []
+
+        async def bound():
+            token = current.set("bound")
+            try:
+                for delta in ("a", "b", "c"):
+                    yield {"type": "content", "delta": delta, "metadata": {}}
+                    seen_after_yield.append(current.get())
+                    await asyncio.sleep(0.03)
+            finally:
+                try:
+                    current.reset(token)
+                except ValueError as exc:
+                    reset_errors.append(exc)
+
+        events = await self._collect(bound(), window=0.01)
+        assert "".join(e["delta"] for e in events) == "abc"
+        assert seen_after_yield == ["bound"] * 3
+
+        stream = _coalesce_content_events(bound(), 0.01)
+        await anext(stream)
+        await stream.aclose()
+        assert reset_errors == []
+        assert current.get() is None
+
+
 # ============================================================================
 # §9  Toolkit adapter timeout  (was test_toolkit_adapter_timeout.py)
 # ============================================================================
@@ -60,6 +60,16 @@ from spoon_bot.runtime.session_registry import SessionRuntimeRegistry
 # ---------------------------------------------------------------------------
 
 
+def _stream_of(*events: dict):
+    """Return an ``agent.stream`` stand-in that yields ``events`` in order."""
+
+    async def _stream(**kwargs):
+        for event in events:
+            yield event
+
+    return _stream
+
+
 def _make_mock_agent(session_key: str = "default", sessions=None):
     """Create a mock agent that behaves enough for gateway tests."""
     agent = AsyncMock()
@@ -97,12 +107,11 @@ def _make_mock_agent(session_key: str = "default", sessions=None):
     agent.process_with_thinking = AsyncMock(return_value=("Hello from test agent", "thinking..."))
 
     # stream yields chunks
-    async def _fake_stream(**kwargs):
-        yield {"type": "content", "delta": "Hello ", "metadata": {}}
-        yield {"type": "content", "delta": "World", "metadata": {}}
-        yield {"type": "done", "delta": "", "metadata": {}}
-
-    agent.stream = _fake_stream
+    agent.stream = _stream_of(
+        {"type": "content", "delta": "Hello ", "metadata": {}},
+        {"type": "content", "delta": "World", "metadata": {}},
+        {"type": "done", "delta": "", "metadata": {}},
+    )
     agent.build_creation_kwargs = MagicMock(return_value={})
     return agent
 
@@ -301,46 +310,25 @@ class TestParamsValidation:
 class TestSessionSwitchValidation:
     """#15: session.switch should reject non-string session_key."""
 
-    def test_object_session_key_rejected(self, client):
-        """session.switch with object session_key returns error."""
+    @pytest.mark.parametrize(
+        "session_key",
+        [{"x": 1}, 123, "  "],
+        ids=["object", "number", "blank"],
+    )
+    def test_invalid_session_key_rejected(self, client, session_key):
+        """session.switch with a non-string or blank session_key returns error."""
         with client.websocket_connect("/v1/ws") as ws:
             ws.receive_json()  # connection.established
             ws.send_json({
                 "type": "request",
                 "id": "sw1",
                 "method": "session.switch",
-                "params": {"session_key": {"x": 1}},
+                "params": {"session_key": session_key},
             })
             resp = ws.receive_json()
             assert resp["type"] == "error"
             assert "INVALID_PARAMS" in resp.get("error", {}).get("code", "")
 
-    def test_number_session_key_rejected(self, client):
-        """session.switch with numeric session_key returns error."""
-        with client.websocket_connect("/v1/ws") as ws:
-            ws.receive_json()
-            ws.send_json({
-                "type": "request",
-                "id": "sw2",
-                "method": "session.switch",
-                "params": {"session_key": 123},
-            })
-            resp = ws.receive_json()
-            assert resp["type"] == "error"
-
-    def test_empty_session_key_rejected(self, client):
-        """session.switch with empty session_key returns error."""
-        with client.websocket_connect("/v1/ws") as ws:
-            ws.receive_json()
-            ws.send_json({
-                "type": "request",
-                "id": "sw3",
-                "method": "session.switch",
-                "params": {"session_key": "  "},
-            })
-            resp = ws.receive_json()
-            assert resp["type"] == "error"
-
     def test_default_string_session_key_accepted(self, client):
         """session.switch with valid default session_key succeeds."""
         with client.websocket_connect("/v1/ws") as ws:
@@ -365,33 +353,29 @@ class TestSessionSwitchValidation:
 class TestSubscribeValidation:
     """#16: subscribe/unsubscribe should reject non-list events."""
 
-    def test_string_events_rejected(self, client):
-        """subscribe with string events returns error."""
+    @pytest.mark.parametrize(
+        ("method", "events"),
+        [
+            ("subscribe", "metrics.update"),
+            ("subscribe", 42),
+            ("unsubscribe", "metrics.update"),
+        ],
+        ids=["subscribe-string", "subscribe-number", "unsubscribe-string"],
+    )
+    def test_non_list_events_rejected(self, client, method, events):
+        """subscribe/unsubscribe with non-list events returns error."""
         with client.websocket_connect("/v1/ws") as ws:
             ws.receive_json()
             ws.send_json({
                 "type": "request",
                 "id": "sub1",
-                "method": "subscribe",
-                "params": {"events": "metrics.update"},
+                "method": method,
+                "params": {"events": events},
             })
             resp = ws.receive_json()
             assert resp["type"] == "error"
             assert "INVALID_PARAMS" in resp.get("error", {}).get("code", "")
 
-    def test_number_events_rejected(self, client):
-        """subscribe with numeric events returns error."""
-        with client.websocket_connect("/v1/ws") as ws:
-            ws.receive_json()
-            ws.send_json({
-                "type": "request",
-                "id": "sub2",
-                "method": "subscribe",
-                "params": {"events": 42},
-            })
-            resp = ws.receive_json()
-            assert resp["type"] == "error"
-
     def test_list_events_accepted(self, client):
         """subscribe with proper list events succeeds."""
         with client.websocket_connect("/v1/ws") as ws:
@@ -406,19 +390,6 @@ class TestSubscribeValidation:
             assert resp["type"] == "response"
             assert "metrics.update" in resp["result"]["subscribed"]
 
-    def test_unsubscribe_string_events_rejected(self, client):
-        """unsubscribe with string events returns error."""
-        with client.websocket_connect("/v1/ws") as ws:
-            ws.receive_json()
-            ws.send_json({
-                "type": "request",
-                "id": "unsub1",
-                "method": "unsubscribe",
-                "params": {"events": "metrics.update"},
-            })
-            resp = ws.receive_json()
-            assert resp["type"] == "error"
-
 
 @pytest.mark.asyncio
 async def test_ws_concurrent_dispatch_respects_connection_limit() -> None:
@@ -897,6 +868,19 @@ class TestAuthRateLimiting:
         time.sleep(1.1)
         assert not limiter.is_blocked("1.2.3.4")
 
+    def test_rate_limiter_prunes_in_place(self):
+        """Pruning should reuse the per-IP list and not track unseen IPs."""
+        limiter = _AuthRateLimiter(max_attempts=3, window_seconds=60)
+
+        limiter.record_failure("1.2.3.4")
+        attempts = limiter._attempts["1.2.3.4"]
+        limiter.record_failure("1.2.3.4")
+        assert not limiter.is_blocked("1.2.3.4")
+        assert limiter._attempts["1.2.3.4"] is attempts
+
+        assert not limiter.is_blocked("5.6.7.8")
+        assert "5.6.7.8" not in limiter._attempts
+
 
 # ===================================================================
 # #7 — Async task API
@@ -1131,8 +1115,8 @@ class TestWSStreamingContent:
         agent = app_module._agent
         assert agent is not None
 
-        async def _stream_with_notice(**kwargs):
-            yield {
+        agent.stream = _stream_of(
+            {
                 "type": "notice",
                 "delta": "Context window near limit. Earlier history was compacted before continuing the latest request.",
                 "metadata": {
@@ -1141,11 +1125,10 @@ class TestWSStreamingContent:
                     "compressed_actions": 5,
                     "visible": True,
                 },
-            }
-            yield {"type": "content", "delta": "Hello from test agent", "metadata": {}}
-            yield {"type": "done", "delta": "", "metadata": {"content": "Hello from test agent"}}
-
-        agent.stream = _stream_with_notice
+            },
+            {"type": "content", "delta": "Hello from test agent", "metadata": {}},
+            {"type": "done", "delta": "", "metadata": {"content": "Hello from test agent"}},
+        )
 
         with client.websocket_connect("/v1/ws") as ws:
             ws.receive_json()  # connection.established
@@ -1184,8 +1167,8 @@ class TestWSStreamingContent:
         agent = app_module._agent
         assert agent is not None
 
-        async def _stream_with_tool_result(**kwargs):
-            yield {
+        agent.stream = _stream_of(
+            {
                 "type": "tool_call",
                 "delta": "",
                 "metadata": {
@@ -1193,8 +1176,8 @@ class TestWSStreamingContent:
                     "name": "shell",
                     "arguments": '{"command":"pwd"}',
                 },
-            }
-            yield {
+            },
+            {
                 "type": "tool_result",
                 "delta": "",
                 "metadata": {
@@ -1203,11 +1186,10 @@ class TestWSStreamingContent:
                     "name": "shell",
                     "result": "/workspace",
                 },
-            }
-            yield {"type": "content", "delta": "Done.", "metadata": {}}
-            yield {"type": "done", "delta": "", "metadata": {"content": "Done."}}
-
-        agent.stream = _stream_with_tool_result
+            },
+            {"type": "content", "delta": "Done.", "metadata": {}},
+            {"type": "done", "delta": "", "metadata": {"content": "Done."}},
+        )
 
         with client.websocket_connect("/v1/ws") as ws:
             ws.receive_json()  # connection.established
@@ -1247,16 +1229,15 @@ class TestWSStreamingContent:
         agent = app_module._agent
         assert agent is not None
 
-        async def _stream_with_thinking(**kwargs):
-            yield {
+        agent.stream = _stream_of(
+            {
                 "type": "thinking",
                 "delta": "Inspecting candidate commands.",
                 "metadata": {"source": "provider"},
-            }
-            yield {"type": "content", "delta": "Final answer.", "metadata": {}}
-            yield {"type": "done", "delta": "", "metadata": {"content": "Final answer."}}
-
-        agent.stream = _stream_with_thinking
+            },
+            {"type": "content", "delta": "Final answer.", "metadata": {}},
+            {"type": "done", "delta": "", "metadata": {"content": "Final answer."}},
+        )
 
         with client.websocket_connect("/v1/ws") as ws:
             ws.receive_json()  # connection.established
@@ -1292,11 +1273,10 @@ class TestWSStreamingContent:
         agent = app_module._agent
         assert agent is not None
 
-        async def _empty_stream(**kwargs):
-            yield {"type": "tool_call", "delta": "", "metadata": {"name": "shell"}}
-            yield {"type": "done", "delta": "", "metadata": {}}
-
-        agent.stream = _empty_stream
+        agent.stream = _stream_of(
+            {"type": "tool_call", "delta": "", "metadata": {"name": "shell"}},
+            {"type": "done", "delta": "", "metadata": {}},
+        )
 
         with client.websocket_connect("/v1/ws") as ws:
             ws.receive_json()  # connection.established
@@ -1597,10 +1577,9 @@ class TestWSStreamingContent:
         agent = app_module._agent
         assert agent is not None
 
-        async def _done_only_stream(**kwargs):
-            yield {"type": "done", "delta": "", "metadata": {"content": "fallback done content"}}
-
-        agent.stream = _done_only_stream
+        agent.stream = _stream_of(
+            {"type": "done", "delta": "", "metadata": {"content": "fallback done content"}},
+        )
 
         with client.websocket_connect("/v1/ws") as ws:
             ws.receive_json()  # connection.established
@@ -1638,16 +1617,15 @@ class TestWSStreamingContent:
         agent = app_module._agent
         assert agent is not None
 
-        async def _stream_with_final_metadata(**kwargs):
-            yield {"type": "content", "delta": "starting task", "metadata": {}}
-            yield {"type": "content", "delta": " continuing", "metadata": {}}
-            yield {
+        agent.stream = _stream_of(
+            {"type": "content", "delta": "starting task", "metadata": {}},
+            {"type": "content", "delta": " continuing", "metadata": {}},
+            {
                 "type": "done",
                 "delta": "",
                 "metadata": {"content": "final concise result"},
-            }
-
-        agent.stream = _stream_with_final_metadata
+            },
+        )
 
         with client.websocket_connect("/v1/ws") as ws:
             ws.receive_json()  # connection.established
@@ -1680,6 +1658,42 @@ class TestWSStreamingContent:
             assert len(done_events) >= 1
             assert done_events[0]["data"]["content"] == "final concise result"
 
+    def test_stream_without_done_joins_content_deltas(self, client):
+        """Without a done event the response is every content delta in order."""
+        agent = app_module._agent
+        assert agent is not None
+
+        agent.stream = _stream_of(
+            {"type": "content", "delta": "alpha ", "metadata": {}},
+            {"type": "content", "delta": "beta ", "metadata": {}},
+            {"type": "content", "delta": "gamma", "metadata": {}},
+            {"type": "thinking", "delta": "ignored", "metadata": {}},
+        )
+
+        with client.websocket_connect("/v1/ws") as ws:
+            ws.receive_json()  # connection.established
+
+            ws.send_json({
+                "type": "request",
+                "id": "stream_without_done",
+                "method": "chat.send",
+                "params": {
+                    "message": "hello stream",
+                    "stream": True,
+                },
+            })
+
+            events = []
+            for _ in range(20):
+                msg = ws.receive_json()
+                events.append(msg)
+                if msg.get("type") == "response":
+                    break
+
+            response = next((e for e in events if e.get("type") == "response"), None)
+            assert response is not None
+            assert response["result"]["content"] == "alpha beta gamma"
+
     def test_stream_complete_event_keeps_full_response(self, client):
         """agent.complete should carry the full response body, not a preview slice."""
         agent = app_module._agent
@@ -1687,10 +1701,9 @@ class TestWSStreamingContent:
 
         full_text = "A" * 260
 
-        async def _stream_with_full_done(**kwargs):
-            yield {"type": "done", "delta": "", "metadata": {"content": full_text}}
-
-        agent.stream = _stream_with_full_done
+        agent.stream = _stream_of(
+            {"type": "done", "delta": "", "metadata": {"content": full_text}},
+        )
 
         with client.websocket_connect("/v1/ws") as ws:
             ws.receive_json()  # connection.established
@@ -1838,6 +1851,27 @@ class TestHTTPChat:
         assert data["success"] is True
         assert data["data"]["response"] == "Hello from test agent"
 
+    def test_chat_non_stream_body_is_model_json(self, client):
+        """The JSON body is the APIResponse's own serialization, byte for byte."""
+        from spoon_bot.gateway.models.responses import APIResponse
+
+        resp = client.post("/v1/agent/chat", json={"message": "hello"})
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/json"
+        model = APIResponse.model_validate_json(resp.content)
+        assert resp.content == model.model_dump_json().encode()
+
+    def test_chat_request_message_sanitization(self):
+        """Clean messages pass through as-is; control characters are stripped."""
+        from spoon_bot.gateway.models.requests import AsyncChatRequest, ChatRequest
+
+        clean = "line one\n\tline two\r\n你好"
+        assert ChatRequest(message=clean).message is clean
+        assert ChatRequest(message="a\x00b\x1bc\nd e").message == "abc\nde"
+        assert AsyncChatRequest(message="hi\x07").message == "hi"
+        with pytest.raises(ValueError):
+            AsyncChatRequest(message="\x00\x01")
+
     def test_chat_stream(self, client):
         """POST /v1/agent/chat stream returns SSE events."""
         resp = client.post(
@@ -1849,6 +1883,9 @@ class TestHTTPChat:
         )
         assert resp.status_code == 200
         assert "text/event-stream" in resp.headers["content-type"]
+        assert resp.headers["cache-control"] == "no-cache"
+        assert resp.headers["x-trace-id"].startswith("trc_")
+        assert resp.text.endswith("data: [DONE]\n\n")
 
     def test_chat_invalid_attachment_path_returns_422(self, client):
         """Bad attachment paths should produce a client-actionable 4xx response."""
@@ -42,8 +42,10 @@ from pathlib import Path
 from typing import Any
 
 # Make sure we import *this* worktree, not any other spoon_bot on PYTHONPATH.
+# Under pytest the ``pythonpath`` ini option has already put it there.
 _REPO_ROOT = Path(__file__).resolve().parents[1]
-sys.path.insert(0, str(_REPO_ROOT))
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
 
 # Disable auth so TestClient requests pass without tokens.
 os.environ.setdefault("GATEWAY_AUTH_REQUIRED", "false")
@@ -20,6 +20,8 @@ from pathlib import Path
 
 import pytest
 
+from spoon_bot.agent.tools.shell import ShellTool
+
 SKILL_DIR = Path.home() / ".spoon-bot" / "workspace" / "skills" / "joker-game-agent"
 CLI_PATH = SKILL_DIR / "cli" / "index.js"
 
@@ -119,8 +121,6 @@ class TestShellToolEnvScrubbing:
     @pytest.mark.asyncio
     async def test_shell_env_printenv_no_private_key(self):
         """Running 'printenv PRIVATE_KEY' via ShellTool should return empty."""
-        from spoon_bot.agent.tools.shell import ShellTool
-
         os.environ["PRIVATE_KEY"] = "0x_test_secret_value"
         try:
             tool = ShellTool(
@@ -137,8 +137,6 @@ class TestShellToolEnvScrubbing:
     @pytest.mark.asyncio
     async def test_shell_env_command_no_leak(self):
         """Running 'env' via ShellTool should not show PRIVATE_KEY."""
-        from spoon_bot.agent.tools.shell import ShellTool
-
         os.environ["PRIVATE_KEY"] = "0xdeadbeef1234567890"
         try:
             tool = ShellTool(
@@ -27,20 +27,16 @@ def _reload_with_missing_mcp_tool(module_name: str) -> dict[str, object]:
     return observed
 
 
-def test_agent_loop_module_loads_when_mcp_tool_import_fails():
-    observed = _reload_with_missing_mcp_tool("spoon_bot.agent.loop")
-    assert observed["mcp_tool_available"] is False
-    assert observed["mcp_tool_is_none"] is True
-
-
-def test_core_module_loads_when_mcp_tool_import_fails():
-    observed = _reload_with_missing_mcp_tool("spoon_bot.core")
-    assert observed["mcp_tool_available"] is False
-    assert observed["mcp_tool_is_none"] is True
-
-
-def test_gateway_core_integration_loads_when_mcp_tool_import_fails():
-    observed = _reload_with_missing_mcp_tool("spoon_bot.gateway.core_integration")
+@pytest.mark.parametrize(
+    "module_name",
+    [
+        "spoon_bot.agent.loop",
+        "spoon_bot.core",
+        "spoon_bot.gateway.core_integration",
+    ],
+)
+def test_module_loads_when_mcp_tool_import_fails(module_name: str):
+    observed = _reload_with_missing_mcp_tool(module_name)
     assert observed["mcp_tool_available"] is False
     assert observed["mcp_tool_is_none"] is True
 
@@ -0,0 +1,518 @@
+"""Tests for rate limiting utilities (spoon_bot.utils.rate_limit)."""
+
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from spoon_bot.utils import rate_limit
+from spoon_bot.utils.rate_limit import (
+    RateLimitConfig,
+    RateLimiter,
+    RateLimiterRegistry,
+    SlidingWindowCounterLimiter,
+    SlidingWindowLimiter,
+    TokenBucketLimiter,
+    UnlimitedLimiter,
+    rate_limited,
+)
+from spoon_bot.utils.errors import RateLimitExceeded
+
+NS = 1_000_000_000
+
+
+# ---------------------------------------------------------------------------
+# RateLimitConfig
+# ---------------------------------------------------------------------------
+
+class TestRateLimitConfig:
+    def test_presets_are_shared_instances(self):
+        assert RateLimitConfig.for_llm_api() is RateLimitConfig.for_llm_api()
+        assert RateLimitConfig.unlimited() is RateLimitConfig.unlimited()
+
+    def test_config_is_immutable(self):
+        config = RateLimitConfig.for_shell()
+        with pytest.raises(AttributeError):
+            config.burst_size = 1
+        assert RateLimitConfig.for_shell().burst_size == 10
+
+
+# ---------------------------------------------------------------------------
+# Behaviour shared by every limiter
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(
+    scope="module",
+    params=[
+        lambda: TokenBucketLimiter(rate=0.001, capacity=3.0),
+        lambda: SlidingWindowLimiter(limit=3, window=60.0),
+        lambda: SlidingWindowCounterLimiter(limit=3, window=60.0),
+    ],
+    ids=["token_bucket", "sliding_window", "sliding_window_counter"],
+)
+def shared_limiter(request):
+    return request.param()
+
+
+@pytest.fixture
+def limiter(shared_limiter):
+    """The module's limiter of each kind, emptied for the next test."""
+    shared_limiter.reset()
+    return shared_limiter
+
+
+class TestCommonLimiting:
+    async def test_allows_capacity_then_limits(self, limiter):
+        # A burst of concurrent callers gets exactly the capacity, then no more.
+        results = await asyncio.gather(*(limiter.acquire() for _ in range(4)))
+        assert sorted(results) == [False, True, True, True]
+        assert await limiter.acquire() is False
+        assert limiter.get_wait_time() > 0
+
+    async def test_reset_restores_capacity(self, limiter):
+        await limiter.acquire(3)
+        assert limiter.get_wait_time() > 0
+        limiter.reset()
+        assert limiter.get_wait_time() == 0.0
+        assert await limiter.acquire(3) is True
+
+    async def test_reset_wakes_waiters(self, limiter):
+        await limiter.acquire(3)
+        waiter = asyncio.create_task(limiter.wait_and_acquire())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        limiter.reset()
+        # The computed wait is minutes long; reset() must cut it short.
+        assert await asyncio.wait_for(waiter, timeout=1.0) < 1.0
+
+
+# ---------------------------------------------------------------------------
+# TokenBucketLimiter
+# ---------------------------------------------------------------------------
+
+class TestTokenBucketLimiter:
+    def test_full_bucket_wait_time_skips_clock(self, monkeypatch):
+        limiter = TokenBucketLimiter(rate=1.0, capacity=2.0)
+        monkeypatch.setattr(
+            rate_limit, "time", SimpleNamespace(monotonic=None, monotonic_ns=None)
+        )
+        assert limiter.get_wait_time(2) == 0.0
+
+    async def test_refill_restarts_from_first_use_after_idle(self, monkeypatch):
+        now_ns = [100 * NS]
+        monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic_ns=lambda: now_ns[0]))
+        limiter = TokenBucketLimiter(rate=1.0, capacity=2.0)
+        now_ns[0] = 500 * NS  # long idle while full
+        assert await limiter.acquire(2) is True
+        # Idle time while full must not count as refill credit.
+        assert await limiter.acquire() is False
+        now_ns[0] = 501 * NS
+        assert await limiter.acquire() is True
+
+    async def test_refill_uses_integer_nanoseconds(self, monkeypatch):
+        now_ns = [0]
+        monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic_ns=lambda: now_ns[0]))
+        limiter = TokenBucketLimiter(rate=3.0, capacity=3.0)
+        assert await limiter.acquire(3) is True
+        # A third of a second at 3 tokens/s refills exactly one token.
+        now_ns[0] = NS // 3 + 1
+        assert limiter.get_wait_time() == 0.0
+        assert await limiter.acquire() is True
+        assert limiter.tokens == pytest.approx(0.0, abs=1e-8)
+        assert limiter.get_wait_time() == pytest.approx(1 / 3)
+
+    async def test_wait_and_acquire_sleeps_until_refill(self):
+        limiter = TokenBucketLimiter(rate=20.0, capacity=1.0)
+        await limiter.acquire()
+        waited = await limiter.wait_and_acquire()
+        # One token refills in 50ms; the waiter should wake close to that.
+        assert 0.03 < waited < 0.5
+
+    async def test_concurrent_waiters_all_acquire(self):
+        limiter = TokenBucketLimiter(rate=50.0, capacity=1.0)
+        await limiter.acquire()
+        waits = await asyncio.wait_for(
+            asyncio.gather(*(limiter.wait_and_acquire() for _ in range(3))), timeout=2.0
+        )
+        assert len(waits) == 3
+
+    @pytest.mark.parametrize("rate", [1.0, float("inf")])
+    async def test_infinite_capacity_never_runs_dry(self, rate):
+        limiter = TokenBucketLimiter(rate=rate, capacity=float("inf"))
+        assert limiter.tokens == float("inf")
+        assert await limiter.acquire_batch(1000) == 1000
+        assert all([await limiter.acquire() for _ in range(100)])
+        assert limiter.get_wait_time(1000) == 0.0
+
+    async def test_zero_rate_is_a_fixed_quota(self):
+        limiter = TokenBucketLimiter(rate=0.0, capacity=2.0)
+        assert await limiter.acquire(2) is True
+        assert await limiter.acquire() is False
+        assert limiter.get_wait_time() == float("inf")
+        waiter = asyncio.create_task(limiter.wait_and_acquire())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        limiter.reset()
+        await asyncio.wait_for(waiter, timeout=1.0)
+
+    async def test_infinite_rate_refills_within_the_same_nanosecond(self, monkeypatch):
+        monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic_ns=lambda: 0))
+        limiter = TokenBucketLimiter(rate=float("inf"), capacity=1.0)
+        for _ in range(3):
+            assert await limiter.acquire() is True
+
+    def test_from_config_uses_burst_size(self):
+        limiter = TokenBucketLimiter.from_config(RateLimitConfig.for_shell())
+        assert limiter.capacity == 10.0
+        assert limiter.rate == 5.0
+
+
+# ---------------------------------------------------------------------------
+# SlidingWindowLimiter
+# ---------------------------------------------------------------------------
+
+class TestSlidingWindowLimiter:
+    async def test_multi_token_acquire_records_each_token(self):
+        limiter = SlidingWindowLimiter(limit=5, window=60.0)
+        assert await limiter.acquire(3) is True
+        assert len(limiter.timestamps) == 3
+        assert await limiter.acquire(3) is False
+
+    async def test_expired_entries_are_popped(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=lambda: now[0]))
+        limiter = SlidingWindowLimiter(limit=2, window=0.05)
+        await limiter.acquire(2)
+        now[0] += 0.06
+        assert await limiter.acquire() is True
+        assert len(limiter.timestamps) == 1
+
+    async def test_acquire_reads_clock_once(self, monkeypatch):
+        calls = []
+
+        def fake_monotonic():
+            calls.append(None)
+            return 100.0
+
+        limiter = SlidingWindowLimiter(limit=5, window=60.0)
+        monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=fake_monotonic))
+        assert await limiter.acquire(2) is True
+        assert len(calls) == 1
+        assert list(limiter.timestamps) == [100.0, 100.0]
+
+    def test_timestamps_use_deque(self):
+        limiter = SlidingWindowLimiter(limit=1, window=1.0)
+        assert isinstance(limiter.timestamps, deque)
+
+    async def test_peek_wait_time_does_not_clean_up(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=lambda: now[0]))
+        limiter = SlidingWindowLimiter(limit=1, window=0.05)
+        await limiter.acquire()
+        assert limiter.peek_wait_time() == pytest.approx(0.05)
+        now[0] += 0.06
+        assert limiter.peek_wait_time() == 0.0
+        assert len(limiter.timestamps) == 1
+        assert SlidingWindowLimiter(limit=1, window=1.0).peek_wait_time() == 0.0
+
+    async def test_peek_wait_time_accounts_for_tokens(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=lambda: now[0]))
+        limiter = SlidingWindowLimiter(limit=3, window=10.0)
+        await limiter.acquire()
+        now[0] += 1.0
+        await limiter.acquire()
+        # One slot is still free, so a single token needs no wait.
+        assert limiter.peek_wait_time() == 0.0
+        # Two tokens need the oldest entry to expire, three need both.
+        assert limiter.peek_wait_time(2) == pytest.approx(9.0)
+        assert limiter.peek_wait_time(3) == pytest.approx(10.0)
+        assert limiter.get_wait_time(3) == pytest.approx(10.0)
+
+    async def test_wait_and_acquire_waits_for_oldest_expiry(self):
+        limiter = SlidingWindowLimiter(limit=1, window=0.05)
+        await limiter.acquire()
+        waited = await limiter.wait_and_acquire()
+        assert waited > 0
+        assert len(limiter.timestamps) == 1
+
+
+# ---------------------------------------------------------------------------
+# SlidingWindowCounterLimiter
+# ---------------------------------------------------------------------------
+
+class TestSlidingWindowCounterLimiter:
+    def test_previous_window_is_weighted(self, monkeypatch):
+        monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=lambda: 15.0))
+        limiter = SlidingWindowCounterLimiter(limit=4, window=10.0)
+        limiter._advance(5.0)
+        limiter.current_count = 4
+        # At t=15 the previous window still overlaps by half: 4 * 0.5 = 2 in use.
+        limiter._advance(15.0)
+        assert limiter._estimate(15.0) == pytest.approx(2.0)
+        assert limiter._try_acquire(3) is False
+        assert limiter._try_acquire(2) is True
+        # One more slot frees up once the previous window decays to 1 (t=17.5).
+        assert limiter.get_wait_time() == pytest.approx(2.5)
+
+    def test_skipped_window_drops_previous_count(self):
+        limiter = SlidingWindowCounterLimiter(limit=4, window=10.0)
+        limiter._advance(10.0)
+        limiter.current_count = 4
+        limiter._advance(35.0)
+        assert limiter.prev_count == 0
+        assert limiter.current_count == 0
+
+    def test_registry_creates_counter_limiter(self):
+        registry = RateLimiterRegistry()
+        limiter = registry.register(
+            "per_user", RateLimitConfig(), limiter_type="sliding_window_counter"
+        )
+        assert isinstance(limiter, SlidingWindowCounterLimiter)
+        assert limiter.limit == 60
+
+
+# ---------------------------------------------------------------------------
+# acquire_batch
+# ---------------------------------------------------------------------------
+
+class TestAcquireBatch:
+    @pytest.mark.parametrize(
+        "make_limiter",
+        [
+            lambda: TokenBucketLimiter(rate=0.001, capacity=3.0),
+            lambda: SlidingWindowLimiter(limit=3, window=60.0),
+            lambda: SlidingWindowCounterLimiter(limit=3, window=60.0),
+        ],
+        ids=["token_bucket", "sliding_window", "sliding_window_counter"],
+    )
+    async def test_grants_available_then_nothing(self, make_limiter):
+        limiter = make_limiter()
+        assert await limiter.acquire_batch(5) == 3
+        assert await limiter.acquire_batch(2) == 0
+        assert await limiter.acquire() is False
+
+    async def test_partial_grant_leaves_remainder(self):
+        limiter = TokenBucketLimiter(rate=0.001, capacity=4.0)
+        assert await limiter.acquire_batch(3) == 3
+        assert await limiter.acquire_batch(3) == 1
+
+    async def test_unlimited_grants_all(self):
+        assert await UnlimitedLimiter().acquire_batch(1000) == 1000
+
+
+# ---------------------------------------------------------------------------
+# UnlimitedLimiter
+# ---------------------------------------------------------------------------
+
+class TestUnlimitedLimiter:
+    @pytest.mark.parametrize(
+        "limiter_cls",
+        [TokenBucketLimiter, SlidingWindowLimiter, SlidingWindowCounterLimiter],
+    )
+    def test_disabled_config_returns_unlimited(self, limiter_cls):
+        limiter = limiter_cls.from_config(RateLimitConfig.unlimited())
+        assert isinstance(limiter, UnlimitedLimiter)
+
+    async def test_never_limits(self):
+        limiter = UnlimitedLimiter()
+        assert all([await limiter.acquire(1000) for _ in range(100)])
+        assert await limiter.wait_and_acquire(1000) == 0.0
+        assert limiter.get_wait_time(1000) == 0.0
+
+
+@pytest.mark.parametrize(
+    "limiter",
+    [
+        TokenBucketLimiter(rate=1.0, capacity=1.0),
+        SlidingWindowLimiter(limit=1, window=1.0),
+        SlidingWindowCounterLimiter(limit=1, window=1.0),
+        UnlimitedLimiter(),
+        RateLimitConfig(),
+    ],
+    ids=lambda obj: type(obj).__name__,
+)
+def test_limiters_use_slots(limiter):
+    assert not hasattr(limiter, "__dict__")
+
+
+def test_rate_limiter_is_structural():
+    class DuckLimiter:
+        async def acquire(self, tokens=1):
+            return True
+
+        async def acquire_batch(self, n):
+            return n
+
+        async def wait_and_acquire(self, tokens=1):
+            return 0.0
+
+        def get_wait_time(self, tokens=1):
+            return 0.0
+
+        def peek_wait_time(self, tokens=1):
+            return 0.0
+
+        def reset(self):
+            pass
+
+    assert isinstance(DuckLimiter(), RateLimiter)
+    assert isinstance(TokenBucketLimiter(rate=1.0, capacity=1.0), RateLimiter)
+    assert not isinstance(object(), RateLimiter)
+
+
+# ---------------------------------------------------------------------------
+# RateLimiterRegistry
+# ---------------------------------------------------------------------------
+
+class TestRateLimiterRegistry:
+    def test_get_or_create_returns_same_instance(self):
+        registry = RateLimiterRegistry()
+        first = registry.get_or_create("api")
+        assert registry.get_or_create("api") is first
+
+    def test_concurrent_get_or_create_registers_once(self):
+        registry = RateLimiterRegistry()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            limiters = list(pool.map(lambda _: registry.get_or_create("shared"), range(32)))
+        assert all(limiter is limiters[0] for limiter in limiters)
+
+    def test_creation_locks_are_striped_by_name(self):
+        registry = RateLimiterRegistry()
+        stripes = len(registry._creation_locks)
+        held = hash("held") & (stripes - 1)
+        other = next(
+            name for name in (f"user-{i}" for i in range(1000))
+            if hash(name) & (stripes - 1) != held
+        )
+        with registry._creation_locks[held]:
+            # Would deadlock if every name shared one lock.
+            assert registry.get_or_create(other) is registry.get(other)
+
+    async def test_named_limiters_are_never_evicted_by_default(self, monkeypatch):
+        clock = SimpleNamespace(now=0.0)
+        monkeypatch.setattr(
+            rate_limit, "time",
+            SimpleNamespace(monotonic=lambda: clock.now, monotonic_ns=lambda: int(clock.now * NS)),
+        )
+        registry = RateLimiterRegistry()
+        monkeypatch.setattr(rate_limit, "_global_registry", registry)
+        held = rate_limit.get_rate_limiter("shell_tool")
+
+        @rate_limited("llm")
+        async def call():
+            return "ok"
+
+        # An hour of steady use of both, with no registry lookups for "shell_tool".
+        for _ in range(36):
+            clock.now += 100.0
+            assert await call() == "ok"
+        llm = registry.get("llm")
+        for i in range(5000):
+            registry.get_or_create(f"other-{i}")
+        assert rate_limit.get_rate_limiter("shell_tool") is held
+        assert rate_limit.get_rate_limiter("llm") is llm
+
+    def test_evicts_least_recently_used(self):
+        registry = RateLimiterRegistry(max_size=2)
+        registry.get_or_create("a")
+        registry.get_or_create("b")
+        registry.get_or_create("a")  # touch "a" so "b" becomes the oldest
+        registry.get_or_create("c")
+        assert registry.get("a") is not None
+        assert registry.get("b") is None
+        assert registry.get("c") is not None
+
+    def test_evicts_idle_limiters_on_register(self, monkeypatch):
+        clock = SimpleNamespace(now=1000.0)
+        monkeypatch.setattr(
+            rate_limit, "time",
+            SimpleNamespace(monotonic=lambda: clock.now, monotonic_ns=lambda: int(clock.now * NS)),
+        )
+        registry = RateLimiterRegistry(idle_ttl=60.0)
+        registry.get_or_create("idle")
+        registry.get_or_create("busy")
+        clock.now += 45.0
+        registry.get_or_create("busy")
+        clock.now += 30.0
+        registry.get_or_create("new")
+        assert registry.get("idle") is None
+        assert registry.get("busy") is not None
+        assert registry.get("new") is not None
+
+    def test_evict_idle_returns_count(self, monkeypatch):
+        clock = SimpleNamespace(now=0.0)
+        monkeypatch.setattr(
+            rate_limit, "time",
+            SimpleNamespace(monotonic=lambda: clock.now, monotonic_ns=lambda: int(clock.now * NS)),
+        )
+        registry = RateLimiterRegistry(idle_ttl=10.0)
+        registry.get_or_create("a")
+        registry.get_or_create("b")
+        assert registry.evict_idle() == 0
+        clock.now = 11.0
+        assert registry.evict_idle() == 2
+        assert registry.get("a") is None
+
+
+# ---------------------------------------------------------------------------
+# rate_limited decorator
+# ---------------------------------------------------------------------------
+
+class TestRateLimitedDecorator:
+    async def test_follows_the_registry_entry(self, monkeypatch):
+        registry = RateLimiterRegistry()
+        monkeypatch.setattr(rate_limit, "_global_registry", registry)
+
+        @rate_limited("decorated", RateLimitConfig(burst_size=1, requests_per_second=0.001))
+        async def call(x):
+            return x * 2
+
+        assert await call(1) == 2
+        first = registry.get("decorated")
+        registry.remove("decorated")
+        # A fresh registry entry is picked up instead of the removed copy.
+        assert await call(2) == 4
+        assert registry.get("decorated") is not first
+        assert registry.get("decorated").get_wait_time() > 0
+
+    async def test_caches_the_limiter_between_calls(self, monkeypatch):
+        registry = RateLimiterRegistry()
+        monkeypatch.setattr(rate_limit, "_global_registry", registry)
+        lookups = []
+        real_get = rate_limit.get_rate_limiter
+
+        def counting_get(name, config=None):
+            lookups.append(name)
+            return real_get(name, config)
+
+        monkeypatch.setattr(rate_limit, "get_rate_limiter", counting_get)
+
+        @rate_limited("cached", RateLimitConfig(burst_size=10, requests_per_second=100.0))
+        async def call():
+            return "ok"
+
+        for _ in range(3):
+            await call()
+        assert lookups == ["cached"]
+        registry.register("cached", RateLimitConfig(burst_size=10))
+        await call()
+        assert lookups == ["cached", "cached"]
+
+    async def test_no_wait_raises_when_limited(self, monkeypatch):
+        limiter = TokenBucketLimiter(rate=0.001, capacity=1.0)
+        monkeypatch.setattr(rate_limit, "get_rate_limiter", lambda name, config=None: limiter)
+
+        @rate_limited("strict", wait=False)
+        async def call():
+            return "ok"
+
+        assert await call() == "ok"
+        with pytest.raises(RateLimitExceeded):
+            await call()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -7,6 +7,8 @@ Merged from:
 
 from __future__ import annotations
 
+import asyncio
+import io
 import os
 import tempfile
 from pathlib import Path
@@ -19,60 +21,55 @@ import pytest
 
 from spoon_bot.agent.tools.shell import CommandValidator, ShellTool, SafeShellTool
 
+# Over-long commands for the display truncation tests, built once at import.
+_LONG_CMDS = tuple("a" * n for n in (100, 200, 500))
 
-class TestCommandValidator:
-    """Tests for the CommandValidator class."""
 
-    @pytest.fixture
-    def validator(self):
-        return CommandValidator()
+@pytest.fixture(scope="module")
+def default_validator():
+    """One default validator shared by the parametrized validator tests."""
+    return CommandValidator()
 
-    @pytest.fixture
-    def whitelist_validator(self):
-        return CommandValidator(whitelist_mode=True)
 
-    @pytest.fixture
-    def strict_validator(self):
-        return CommandValidator(strict_mode=True)
+class TestCommandValidator:
+    """Tests for the CommandValidator class."""
 
     # -- Dangerous commands --
 
     class TestDangerousCommands:
 
-        @pytest.mark.parametrize("command", [
-            "rm -rf /", "rm -rf /*", "rm -rf ~", "rm -rf ~/*",
-            "rm -rf .", "rm -fr /", "sudo rm -rf /", "  rm -rf /  ",
-        ])
-        def test_blocks_recursive_deletion(self, command):
-            v = CommandValidator()
-            is_valid, error = v.validate(command)
-            assert not is_valid
-            assert error is not None
-            assert "dangerous" in error.lower() or "blocked" in error.lower()
+        # One validator and one loop per group: the assertion is the same for
+        # every command, and the command is named in the failure message.
 
-        @pytest.mark.parametrize("command", [
-            "mkfs.ext4 /dev/sda",
-            "dd if=/dev/zero of=/dev/sda",
-            "dd if=/dev/random of=/dev/sdb",
-        ])
-        def test_blocks_disk_operations(self, command):
+        def test_blocks_recursive_deletion(self):
             v = CommandValidator()
-            is_valid, _ = v.validate(command)
-            assert not is_valid
-
-        @pytest.mark.parametrize("command", [
-            "format c:", "format d:",
-            "del /f /s /q c:\\", "rd /s /q c:\\",
-        ])
-        def test_blocks_windows_destructive(self, command):
+            for command in (
+                "rm -rf /", "rm -rf /*", "rm -rf ~", "rm -rf ~/*",
+                "rm -rf .", "rm -fr /", "sudo rm -rf /", "  rm -rf /  ",
+            ):
+                is_valid, error = v.validate(command)
+                assert not is_valid, command
+                assert error is not None, command
+                assert "dangerous" in error.lower() or "blocked" in error.lower(), command
+
+        def test_blocks_disk_operations(self):
             v = CommandValidator()
-            is_valid, _ = v.validate(command)
-            assert not is_valid
-
-        def test_blocks_fork_bomb(self):
+            for command in (
+                "mkfs.ext4 /dev/sda",
+                "dd if=/dev/zero of=/dev/sda",
+                "dd if=/dev/random of=/dev/sdb",
+            ):
+                is_valid, _ = v.validate(command)
+                assert not is_valid, command
+
+        def test_blocks_windows_destructive(self):
             v = CommandValidator()
-            is_valid, _ = v.validate(":(){ :|:& };:")
-            assert not is_valid
+            for command in (
+                "format c:", "format d:",
+                "del /f /s /q c:\\", "rd /s /q c:\\",
+            ):
+                is_valid, _ = v.validate(command)
+                assert not is_valid, command
 
     # -- Injection patterns --
 
@@ -83,9 +80,8 @@ class TestCommandValidator:
             "echo hello; cat /etc/passwd",
             "pwd ;cat /etc/shadow",
         ])
-        def test_blocks_semicolon_chaining(self, command):
-            v = CommandValidator()
-            is_valid, error = v.validate(command)
+        def test_blocks_semicolon_chaining(self, default_validator, command):
+            is_valid, error = default_validator.validate(command)
             assert not is_valid
             assert "injection" in error.lower() or "blocked" in error.lower()
 
@@ -94,9 +90,8 @@ class TestCommandValidator:
             "echo hello\rwhoami",
             "echo hello\r\nid",
         ])
-        def test_blocks_newline_chaining(self, command):
-            v = CommandValidator()
-            is_valid, error = v.validate(command)
+        def test_blocks_newline_chaining(self, default_validator, command):
+            is_valid, error = default_validator.validate(command)
             assert not is_valid
             assert "injection" in error.lower() or "blocked" in error.lower()
 
@@ -104,9 +99,8 @@ class TestCommandValidator:
             "ls && echo hello",
             "echo test && cat /etc/passwd",
         ])
-        def test_blocks_and_chaining(self, command):
-            v = CommandValidator()
-            is_valid, error = v.validate(command)
+        def test_blocks_and_chaining(self, default_validator, command):
+            is_valid, error = default_validator.validate(command)
             assert not is_valid
             assert "injection" in error.lower() or "blocked" in error.lower()
 
@@ -114,9 +108,8 @@ class TestCommandValidator:
             "ls || echo hello",
             "false || cat /etc/passwd",
         ])
-        def test_blocks_or_chaining(self, command):
-            v = CommandValidator()
-            is_valid, error = v.validate(command)
+        def test_blocks_or_chaining(self, default_validator, command):
+            is_valid, error = default_validator.validate(command)
             assert not is_valid
             assert "injection" in error.lower() or "blocked" in error.lower()
 
@@ -125,9 +118,8 @@ class TestCommandValidator:
             "ls $(whoami)",
             "ping $(hostname)",
         ])
-        def test_blocks_command_substitution(self, command):
-            v = CommandValidator()
-            is_valid, error = v.validate(command)
+        def test_blocks_command_substitution(self, default_validator, command):
+            is_valid, error = default_validator.validate(command)
             assert not is_valid
             assert "injection" in error.lower()
 
@@ -135,9 +127,8 @@ class TestCommandValidator:
             "echo `cat /etc/passwd`",
             "ls `whoami`",
         ])
-        def test_blocks_backtick_substitution(self, command):
-            v = CommandValidator()
-            is_valid, error = v.validate(command)
+        def test_blocks_backtick_substitution(self, default_validator, command):
+            is_valid, error = default_validator.validate(command)
             assert not is_valid
             assert "injection" in error.lower()
 
@@ -147,9 +138,8 @@ class TestCommandValidator:
             "echo key > ~/.ssh/authorized_keys",
             "echo export > ~/.bashrc",
         ])
-        def test_blocks_dangerous_redirections(self, command):
-            v = CommandValidator()
-            is_valid, error = v.validate(command)
+        def test_blocks_dangerous_redirections(self, default_validator, command):
+            is_valid, error = default_validator.validate(command)
             assert not is_valid
             assert "injection" in error.lower()
 
@@ -189,9 +179,8 @@ class TestCommandValidator:
             "cat README.md", "grep pattern file.txt", "echo 'hello world'",
             "mkdir new_folder", "cp file1.txt file2.txt", "mv old.txt new.txt",
         ])
-        def test_allows_safe_commands(self, command):
-            v = CommandValidator()
-            ok, err = v.validate(command)
+        def test_allows_safe_commands(self, default_validator, command):
+            ok, err = default_validator.validate(command)
             assert ok, f"'{command}' blocked: {err}"
 
     # -- Pipe handling --
@@ -219,6 +208,13 @@ class TestCommandValidator:
                 ok, _ = v.validate(cmd)
                 assert not ok, f"'{cmd}' should be blocked"
 
+        def test_reports_every_sensitive_path(self):
+            v = CommandValidator(strict_mode=True)
+            for path in CommandValidator.SENSITIVE_PATHS:
+                ok, err = v.validate(f"head {path}")
+                assert not ok, path
+                assert f"'{path}'" in err, path
+
         def test_allows_sensitive_in_normal_mode(self):
             v = CommandValidator(strict_mode=False)
             ok, _ = v.validate("cat /etc/hosts")
@@ -234,33 +230,106 @@ class TestCommandValidator:
             assert not ok
             assert "blocklist" in err.lower()
 
+        def test_custom_pattern_reported_in_original_case(self):
+            v = CommandValidator(custom_blocklist={"Bad_Command"})
+            ok, err = v.validate("echo ok; BAD_COMMAND now")
+            assert not ok
+            assert "'Bad_Command'" in err
+
+        def test_custom_pattern_needs_command_boundary(self):
+            v = CommandValidator(custom_blocklist={"bad_command"})
+            ok, _ = v.validate("echo not_bad_command")
+            assert ok
+
     # -- Edge cases --
 
     class TestEdgeCases:
 
-        def test_empty_command(self):
+        @pytest.mark.parametrize("command, expected_ok, needle", [
+            ("", False, "empty"),
+            ("   ", False, None),
+            (":(){ :|:& };:", False, None),
+            ("curl 'https://wttr.in/paris?format=3'", True, None),
+        ], ids=["empty", "whitespace", "fork_bomb", "format_inside_url"])
+        def test_single_command_verdicts(self, default_validator, command, expected_ok, needle):
+            ok, err = default_validator.validate(command)
+            assert ok is expected_ok, err
+            if needle:
+                assert needle in err.lower()
+
+        def test_repeated_validation_is_cached_and_bounded(self, monkeypatch):
             v = CommandValidator()
-            ok, err = v.validate("")
-            assert not ok
-            assert "empty" in err.lower()
-
-        def test_whitespace_only(self):
+            monkeypatch.setattr(v, "_VALIDATE_CACHE_SIZE", 2)
+            first = v.validate("ls -la")
+            assert v.validate("ls -la") is first
+            assert v.validate("rm -rf /")[0] is False
+            v.validate("pwd")
+            assert list(v._validate_cache) == ["rm -rf /", "pwd"]
+
+        def test_long_commands_are_not_cached(self):
             v = CommandValidator()
-            ok, _ = v.validate("   ")
-            assert not ok
+            long_cmd = "echo " + "x" * v._VALIDATE_CACHE_MAX_COMMAND
+            assert v.validate(long_cmd)[0] is True
+            assert long_cmd not in v._validate_cache
+
+        def test_policy_settings_are_read_only(self):
+            v = CommandValidator(strict_mode=False)
+            for name in ("strict_mode", "allow_pipes", "whitelist_mode"):
+                with pytest.raises(AttributeError):
+                    setattr(v, name, True)
+            assert isinstance(v.custom_blocklist, frozenset)
 
         def test_sanitize_truncates(self):
             v = CommandValidator()
-            s = v.sanitize_for_display("a" * 200, max_length=50)
-            assert len(s) <= 53
-            assert s.endswith("...")
+            for command in _LONG_CMDS:
+                s = v.sanitize_for_display(command, max_length=50)
+                assert len(s) <= 53, len(command)
+                assert s.endswith("..."), len(command)
 
 
-class TestShellTool:
+class _FinishedProcess:
+    """Stand-in for a Popen that has already exited successfully."""
+
+    pid = 0
+    returncode = 0
+
+    def __init__(self, stdout: bytes = b"", stderr: bytes = b""):
+        self.stdout = io.BytesIO(stdout)
+        self.stderr = io.BytesIO(stderr)
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        return self.returncode
+
 
-    @pytest.fixture
-    def shell_tool(self):
-        return ShellTool(timeout=5)
+@pytest.fixture
+def fake_process(monkeypatch):
+    """Skip the fork/exec for tests that only check what validation allows."""
+    spawned = []
+
+    async def create_process(self, command, cwd):
+        spawned.append(command)
+        return _FinishedProcess(stdout=b"test\n")
+
+    monkeypatch.setattr(ShellTool, "_create_process", create_process)
+    return spawned
+
+
+# The shell tool tests only execute commands against these, so one of each
+# serves the whole module.
+@pytest.fixture(scope="module")
+def shell_tool():
+    return ShellTool(timeout=5)
+
+
+@pytest.fixture(scope="module")
+def safe_shell():
+    return SafeShellTool(timeout=5)
+
+
+class TestShellTool:
 
     @pytest.mark.asyncio
     async def test_blocks_dangerous(self, shell_tool):
@@ -275,9 +344,11 @@ class TestShellTool:
         assert "injection" in r.lower()
 
     @pytest.mark.asyncio
-    async def test_allows_safe(self, shell_tool):
+    async def test_allows_safe(self, shell_tool, fake_process):
         r = await shell_tool.execute("echo 'test'")
         assert "Security Error" not in r
+        assert fake_process == ["echo 'test'"]
+        assert "test" in r
 
     @pytest.mark.asyncio
     async def test_invalid_working_dir(self, shell_tool):
@@ -288,10 +359,6 @@ class TestShellTool:
 
 class TestSafeShellTool:
 
-    @pytest.fixture
-    def safe_shell(self):
-        return SafeShellTool(timeout=5)
-
     @pytest.mark.asyncio
     async def test_blocks_non_whitelisted(self, safe_shell):
         r = await safe_shell.execute("some_unknown_command")
@@ -299,9 +366,10 @@ class TestSafeShellTool:
         assert "whitelist" in r.lower()
 
     @pytest.mark.asyncio
-    async def test_allows_whitelisted(self, safe_shell):
+    async def test_allows_whitelisted(self, safe_shell, fake_process):
         r = await safe_shell.execute("echo 'hello'")
         assert "Security Error" not in r
+        assert fake_process == ["echo 'hello'"]
 
     def test_name(self, safe_shell):
         assert safe_shell.name == "safe_shell"
@@ -328,98 +396,158 @@ from spoon_bot.agent.tools.filesystem import (
     ListDirTool,
 )
 
+# Resolved once; the sensitive-path tests only need the real home directory.
+_HOME = Path.home()
+# A real system file outside any workspace, per platform.
+_SYSTEM_FILE = "C:\\Windows\\System32\\config\\sam" if os.name == "nt" else "/etc/passwd"
+
+
+def _write_raw(path: Path, data: bytes) -> None:
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
 
-@pytest.fixture
-def temp_workspace():
-    with tempfile.TemporaryDirectory() as tmpdir:
-        workspace = Path(tmpdir) / "workspace"
-        workspace.mkdir()
-        (workspace / "test.txt").write_text("Hello, World!")
-        (workspace / "subdir").mkdir()
-        (workspace / "subdir" / "nested.txt").write_text("Nested content")
-        yield workspace
+
+def _make_workspace(root: Path) -> Path:
+    workspace = root / "workspace"
+    os.mkdir(workspace)
+    os.mkdir(workspace / "subdir")
+    _write_raw(workspace / "test.txt", b"Hello, World!")
+    _write_raw(workspace / "subdir" / "nested.txt", b"Nested content")
+    return workspace
+
+
+@pytest.fixture(scope="module")
+def temp_root(fast_tmp_root):
+    """One directory holding every mutable workspace of this module."""
+    return Path(tempfile.mkdtemp(prefix="fs_tests", dir=fast_tmp_root))
 
 
 @pytest.fixture
-def validator(temp_workspace):
-    return PathValidator(workspace=temp_workspace)
+def temp_workspace(temp_root, request):
+    """Fresh workspace for tests that create, modify or link files."""
+    # mkdtemp adds a unique suffix, so repeated or parametrized node names
+    # never collide; the prefix only keeps the directory recognizable.
+    prefix = "".join(c if c.isalnum() else "_" for c in request.node.name)[:40]
+    return _make_workspace(Path(tempfile.mkdtemp(prefix=prefix, dir=temp_root)))
+
+
+@pytest.fixture(scope="session")
+def ro_workspace(fast_tmp_root):
+    """Workspace shared by tests that only validate, read or list."""
+    return _make_workspace(Path(tempfile.mkdtemp(prefix="ro", dir=fast_tmp_root)))
+
+
+@pytest.fixture(scope="session")
+def validator(ro_workspace):
+    return PathValidator(workspace=ro_workspace)
 
 
 class TestPathValidator:
 
-    def test_valid_path(self, validator, temp_workspace):
-        r = validator.validate_read_path(temp_workspace / "test.txt")
+    def test_valid_path(self, validator, ro_workspace):
+        r = validator.validate_read_path(ro_workspace / "test.txt")
         assert r.valid is True
-        assert r.resolved_path == temp_workspace / "test.txt"
+        assert r.resolved_path == ro_workspace / "test.txt"
+
+    def test_relative_path_resolves_against_workspace(self, validator, ro_workspace):
+        r = validator.validate_read_path("subdir/nested.txt")
+        assert r.valid is True
+        assert r.resolved_path == ro_workspace / "subdir" / "nested.txt"
 
-    def test_traversal_blocked(self, validator, temp_workspace):
-        r = validator.validate_read_path(temp_workspace / ".." / ".." / "etc" / "passwd")
+    def test_traversal_blocked(self, validator, ro_workspace):
+        r = validator.validate_read_path(ro_workspace / ".." / ".." / "etc" / "passwd")
         assert r.valid is False
         assert "outside workspace" in r.error.lower()
 
-    def test_absolute_outside_blocked(self, validator, temp_workspace):
-        if os.name == "nt":
-            r = validator.validate_read_path("C:\\Windows\\System32\\config\\sam")
-        else:
-            r = validator.validate_read_path("/etc/passwd")
+    def test_absolute_outside_blocked(self, validator, ro_workspace):
+        r = validator.validate_read_path(_SYSTEM_FILE)
         assert r.valid is False
 
-    def test_sensitive_blocked(self, validator, temp_workspace):
+    def test_sensitive_blocked(self, validator, ro_workspace):
         r = validator.validate_read_path("/etc/passwd")
         assert r.valid is False
 
-    def test_ssh_key_blocked(self, validator, temp_workspace):
-        r = validator.validate_read_path(Path.home() / ".ssh" / "id_rsa")
+    def test_ssh_key_blocked(self, validator, ro_workspace):
+        r = validator.validate_read_path(_HOME / ".ssh" / "id_rsa")
         assert r.valid is False
 
-    def test_write_outside_blocked(self, validator, temp_workspace):
+    def test_write_outside_blocked(self, validator, ro_workspace):
         r = validator.validate_write_path("/tmp/outside.txt")
         assert r.valid is False
 
-    def test_write_valid(self, validator, temp_workspace):
-        r = validator.validate_write_path(temp_workspace / "new_file.txt")
+    def test_write_valid(self, validator, ro_workspace):
+        r = validator.validate_write_path(ro_workspace / "new_file.txt")
         assert r.valid is True
 
-    def test_write_nested(self, validator, temp_workspace):
-        r = validator.validate_write_path(temp_workspace / "new_dir" / "new_file.txt")
+    def test_write_nested(self, validator, ro_workspace):
+        r = validator.validate_write_path(ro_workspace / "new_dir" / "new_file.txt")
         assert r.valid is True
 
-    def test_dir_valid(self, validator, temp_workspace):
-        r = validator.validate_directory_path(temp_workspace / "subdir")
+    def test_dir_valid(self, validator, ro_workspace):
+        r = validator.validate_directory_path(ro_workspace / "subdir")
         assert r.valid is True
 
-    def test_dir_outside_blocked(self, validator, temp_workspace):
+    def test_dir_outside_blocked(self, validator, ro_workspace):
         r = validator.validate_directory_path("/etc")
         assert r.valid is False
 
+    def test_sibling_with_shared_prefix_blocked(self, temp_workspace):
+        validator = PathValidator(workspace=temp_workspace)
+        sibling = temp_workspace.parent / (temp_workspace.name + "2")
+        sibling.mkdir()
+        (sibling / "data.txt").write_text("outside")
+        assert validator.validate_read_path(sibling / "data.txt").valid is False
+        assert validator.validate_write_path(sibling / "new.txt").valid is False
+
 
 class TestFilesystemTools:
 
     @pytest.mark.asyncio
-    async def test_read_ok(self, temp_workspace):
-        t = ReadFileTool(workspace=temp_workspace)
-        r = await t.execute(path=str(temp_workspace / "test.txt"))
-        assert "Hello, World!" in r
+    async def test_read_missing_or_directory(self, ro_workspace):
+        t = ReadFileTool(workspace=ro_workspace)
+        r = await t.execute(path=str(ro_workspace / "missing.txt"))
+        assert r.startswith("Error: File not found")
+        r = await t.execute(path=str(ro_workspace / "subdir"))
+        assert r.startswith("Error: Not a file")
 
     @pytest.mark.asyncio
-    async def test_read_traversal_blocked(self, temp_workspace):
+    async def test_read_decodes_like_text_mode(self, temp_workspace):
+        (temp_workspace / "crlf.txt").write_bytes(b"one\r\ntwo\rthree")
+        (temp_workspace / "latin1.txt").write_bytes("caf\xe9".encode("latin-1"))
         t = ReadFileTool(workspace=temp_workspace)
-        r = await t.execute(path=str(temp_workspace / ".." / ".." / "etc" / "passwd"))
+        assert "one\ntwo\nthree" in await t.execute(path=str(temp_workspace / "crlf.txt"))
+        assert "caf\xe9" in await t.execute(path=str(temp_workspace / "latin1.txt"))
+
+    @pytest.mark.asyncio
+    async def test_read_traversal_blocked(self, ro_workspace):
+        t = ReadFileTool(workspace=ro_workspace)
+        r = await t.execute(path=str(ro_workspace / ".." / ".." / "etc" / "passwd"))
         assert "Security Error" in r
         assert "outside workspace" in r.lower()
 
     @pytest.mark.asyncio
-    async def test_read_sensitive_blocked(self, temp_workspace):
-        t = ReadFileTool(workspace=temp_workspace)
-        r = await t.execute(path="/etc/passwd")
+    async def test_read_sensitive_blocked(self, ro_workspace):
+        t = ReadFileTool(workspace=ro_workspace)
+        r = await t.execute(path=_SYSTEM_FILE)
         assert "Security Error" in r
 
     @pytest.mark.asyncio
-    async def test_write_ok(self, temp_workspace):
-        t = WriteFileTool(workspace=temp_workspace)
-        r = await t.execute(path=str(temp_workspace / "new_file.txt"), content="New content")
+    async def test_write_read_list_roundtrip(self, temp_workspace):
+        target = temp_workspace / "new_file.txt"
+        r = await WriteFileTool(workspace=temp_workspace).execute(
+            path=str(target), content="New content"
+        )
         assert "Successfully wrote" in r
-        assert (temp_workspace / "new_file.txt").read_text() == "New content"
+        assert target.read_text() == "New content"
+        r = await ReadFileTool(workspace=temp_workspace).execute(path=str(target))
+        assert "New content" in r
+        r = await ListDirTool(workspace=temp_workspace).execute(path=str(temp_workspace))
+        assert "[FILE]" in r and "[DIR]" in r
+        for name in ("new_file.txt", "test.txt", "subdir"):
+            assert name in r
 
     @pytest.mark.asyncio
     async def test_write_traversal_blocked(self, temp_workspace):
@@ -450,25 +578,60 @@ class TestFilesystemTools:
         assert "Security Error" in r
 
     @pytest.mark.asyncio
-    async def test_list_dir_ok(self, temp_workspace):
-        t = ListDirTool(workspace=temp_workspace)
-        r = await t.execute(path=str(temp_workspace))
-        assert "[FILE]" in r or "[DIR]" in r
-        assert "test.txt" in r
-        assert "subdir" in r
-
-    @pytest.mark.asyncio
-    async def test_list_dir_traversal_blocked(self, temp_workspace):
-        t = ListDirTool(workspace=temp_workspace)
-        r = await t.execute(path=str(temp_workspace / ".." / ".."))
+    async def test_list_dir_traversal_blocked(self, ro_workspace):
+        t = ListDirTool(workspace=ro_workspace)
+        r = await t.execute(path=str(ro_workspace / ".." / ".."))
         assert "Security Error" in r
 
     @pytest.mark.asyncio
-    async def test_list_dir_outside_blocked(self, temp_workspace):
-        t = ListDirTool(workspace=temp_workspace)
+    async def test_list_dir_outside_blocked(self, ro_workspace):
+        t = ListDirTool(workspace=ro_workspace)
         r = await t.execute(path="/etc")
         assert "Security Error" in r
 
+    @pytest.mark.asyncio
+    async def test_concurrent_readonly_calls(self, ro_workspace):
+        # The read-only checks above, issued together on one loop: the tools
+        # share a cached validator and push file reads to worker threads.
+        read = ReadFileTool(workspace=ro_workspace)
+        ls = ListDirTool(workspace=ro_workspace)
+        results = await asyncio.gather(
+            read.execute(path=str(ro_workspace / "test.txt")),
+            read.execute(path=str(ro_workspace / "subdir" / "nested.txt")),
+            read.execute(path=str(ro_workspace / ".." / ".." / "etc" / "passwd")),
+            read.execute(path=_SYSTEM_FILE),
+            ls.execute(path=str(ro_workspace)),
+            ls.execute(path=str(ro_workspace / ".." / "..")),
+            ls.execute(path="/etc"),
+        )
+        ok_read, nested, traversal, sensitive, listing, ls_traversal, ls_outside = results
+        assert "Hello, World!" in ok_read
+        assert "Nested content" in nested
+        assert "test.txt" in listing and "subdir" in listing
+        for r in (traversal, sensitive, ls_traversal, ls_outside):
+            assert "Security Error" in r
+
+    def test_relative_workspace_follows_cwd(self, tmp_path, monkeypatch):
+        for name in ("a", "b"):
+            os.makedirs(tmp_path / name / "ws")
+            _write_raw(tmp_path / name / "ws" / "f.txt", b"")
+        monkeypatch.chdir(tmp_path / "a")
+        assert validate_read_path("f.txt", workspace=Path("ws")).resolved_path == (
+            tmp_path / "a" / "ws" / "f.txt"
+        )
+        monkeypatch.chdir(tmp_path / "b")
+        assert validate_read_path("f.txt", workspace=Path("ws")).resolved_path == (
+            tmp_path / "b" / "ws" / "f.txt"
+        )
+
+    def test_tools_share_validator_per_workspace(self, ro_workspace):
+        write = WriteFileTool(workspace=ro_workspace)
+        edit = EditFileTool(workspace=ro_workspace)
+        assert write._validator is edit._validator
+        assert ReadFileTool(workspace=ro_workspace)._validator is ListDirTool(
+            workspace=ro_workspace
+        )._validator
+
 
 class TestSymlinkSecurity:
 
@@ -486,6 +649,47 @@ class TestSymlinkSecurity:
         if "escape_link" in r:
             assert "outside workspace" in r or "broken" in r
 
+    @pytest.mark.asyncio
+    async def test_list_dir_marks_only_escaping_links(self, temp_workspace):
+        if os.name == "nt":
+            pytest.skip("Symlink test requires admin on Windows")
+        shared = temp_workspace.parent / "shared"
+        shared.mkdir()
+        try:
+            (temp_workspace / "sub_link").symlink_to(temp_workspace / "subdir")
+            (temp_workspace / "shared_link").symlink_to(shared)
+            (temp_workspace / "etc_link").symlink_to("/etc")
+            (temp_workspace / "dangling").symlink_to(temp_workspace / "missing")
+        except OSError:
+            pytest.skip("Cannot create symlink")
+        t = ListDirTool(workspace=temp_workspace, additional_read_paths=[shared])
+        r = await t.execute(path=str(temp_workspace))
+        assert "[DIR]  sub_link/" in r
+        assert "[DIR]  shared_link/" in r
+        assert "[LINK] etc_link -> (outside workspace)" in r
+        assert "[DIR]  etc_link/" not in r
+        assert "[LINK] dangling -> (broken)" in r
+
+    def test_symlink_chain_checked_by_final_target(self, temp_workspace):
+        if os.name == "nt":
+            pytest.skip("Symlink test requires admin on Windows")
+        outside = temp_workspace.parent / "outside.txt"
+        outside.write_text("secret")
+        try:
+            (temp_workspace / "hop").symlink_to(temp_workspace / "test.txt")
+            (temp_workspace / "inner").symlink_to(temp_workspace / "hop")
+            (temp_workspace / "escape").symlink_to(outside)
+            (temp_workspace / "escape_hop").symlink_to(temp_workspace / "escape")
+        except OSError:
+            pytest.skip("Cannot create symlink")
+        v = PathValidator(workspace=temp_workspace, allow_outside_workspace=True)
+        r = v.validate_read_path(temp_workspace / "inner")
+        assert r.valid is True
+        assert r.resolved_path == temp_workspace / "test.txt"
+        r = v.validate_read_path(temp_workspace / "escape_hop")
+        assert r.valid is False
+        assert "escapes workspace" in r.error
+
 
 class TestPathEdgeCases:
 
@@ -493,28 +697,50 @@ class TestPathEdgeCases:
         v = PathValidator()
         assert v.workspace == Path.cwd().resolve()
 
-    def test_expanduser(self, temp_workspace):
-        v = PathValidator(workspace=temp_workspace)
+    def test_expanduser(self, ro_workspace):
+        v = PathValidator(workspace=ro_workspace)
         r = v.validate_read_path("~/.ssh/id_rsa")
         assert r.valid is False
 
-    def test_case_insensitive(self, temp_workspace):
-        v = PathValidator(workspace=temp_workspace)
+    def test_case_insensitive(self, ro_workspace):
+        v = PathValidator(workspace=ro_workspace)
         for p in ["/ETC/PASSWD", "/Etc/Passwd", "/etc/PASSWD"]:
             r = v.validate_read_path(p)
             assert r.valid is False
 
+    def test_sensitive_filename_outside_blocked(self, ro_workspace):
+        v = PathValidator(workspace=ro_workspace, allow_outside_workspace=True)
+        outside = ro_workspace.parent
+        r = v.validate_read_path(outside / "Prod_API_KEY.txt")
+        assert r.valid is False
+        assert "api_key" in r.error
+        assert v.validate_read_path(outside / "notes.txt").valid is True
+
     def test_dotenv_in_workspace_allowed(self, temp_workspace):
         (temp_workspace / ".env").write_text("API_KEY=test")
         v = PathValidator(workspace=temp_workspace)
         r = v.validate_read_path(temp_workspace / ".env")
         assert r.valid is True
 
-    def test_credentials_outside_blocked(self, temp_workspace):
-        v = PathValidator(workspace=temp_workspace)
-        r = v.validate_read_path(Path.home() / ".aws" / "credentials")
+    def test_credentials_outside_blocked(self, ro_workspace):
+        v = PathValidator(workspace=ro_workspace)
+        r = v.validate_read_path(_HOME / ".aws" / "credentials")
         assert r.valid is False
 
 
+class TestTempWorkspace:
+    """Tests sharing a node name still get separate workspaces."""
+
+    class TestFirst:
+        def test_workspace_is_fresh(self, temp_workspace):
+            assert sorted(os.listdir(temp_workspace)) == ["subdir", "test.txt"]
+            _write_raw(temp_workspace / "marker", b"")
+
+    class TestSecond:
+        def test_workspace_is_fresh(self, temp_workspace):
+            assert sorted(os.listdir(temp_workspace)) == ["subdir", "test.txt"]
+            _write_raw(temp_workspace / "marker", b"")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
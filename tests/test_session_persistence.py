@@ -17,7 +17,6 @@ import asyncio
 import json
 import os
 import shutil
-import tempfile
 from datetime import datetime
 from pathlib import Path
 from types import SimpleNamespace
@@ -41,9 +40,8 @@ from spoon_bot.session.store import (
 
 
 @pytest.fixture
-def tmp_dir() -> Generator[Path, None, None]:
-    with tempfile.TemporaryDirectory() as td:
-        yield Path(td)
+def tmp_dir(tmp_path: Path) -> Path:
+    return tmp_path
 
 
 @pytest.fixture
@@ -1022,6 +1020,10 @@ class _RetryThinkingRuntimeAgent(_ThinkingRuntimeAgent):
         )()
 
 
+async def _skip_request_context(message: Any) -> None:
+    """Stand-in for ``AgentLoop._prepare_request_context``; nothing to inject."""
+
+
 def _build_process_test_loop(tmp_dir: Path, *, agent: Any, session: Session):
     from spoon_bot.agent.context import ContextBuilder
     from spoon_bot.agent.loop import AgentLoop
@@ -1042,7 +1044,7 @@ def _build_process_test_loop(tmp_dir: Path, *, agent: Any, session: Session):
     loop.sessions.save = MagicMock()
     loop._auto_commit = False
     loop._git = None
-    loop._prepare_request_context = AsyncMock(return_value=None)
+    loop._prepare_request_context = _skip_request_context
     loop._build_step_prompt = lambda message: f"prompt::{message}"
     loop._install_anti_loop_tracker = lambda prompt: None
     loop._restore_agent_think = lambda: None
@@ -1050,6 +1052,25 @@ def _build_process_test_loop(tmp_dir: Path, *, agent: Any, session: Session):
     return loop
 
 
+def _build_stream_test_loop(tmp_dir: Path, *, agent: Any, session_key: str):
+    from spoon_bot.agent.loop import AgentLoop
+
+    loop = AgentLoop.__new__(AgentLoop)
+    loop._initialized = True
+    loop._agent = agent
+    loop.workspace = tmp_dir
+    loop._session = Session(session_key=session_key)
+    loop.sessions = MagicMock()
+    loop.sessions.save = MagicMock()
+    loop.memory = MagicMock()
+    loop.memory.get_memory_context = MagicMock(return_value=None)
+    loop.context = MagicMock()
+    loop._prepare_request_context = _skip_request_context
+    loop._build_step_prompt = lambda message: f"prompt::{message}"
+    loop._install_anti_loop_tracker = lambda prompt: None
+    return loop
+
+
 class TestAgentLoopCurrentRequestMultimodal:
     @pytest.mark.asyncio
     async def test_process_injects_multimodal_request_before_run(self, tmp_dir: Path):
@@ -1075,7 +1096,7 @@ class TestAgentLoopCurrentRequestMultimodal:
         loop.sessions.save = MagicMock()
         loop._auto_commit = False
         loop._git = None
-        loop._prepare_request_context = AsyncMock(return_value=None)
+        loop._prepare_request_context = _skip_request_context
         loop._build_step_prompt = lambda message: f"prompt::{message}"
         loop._install_anti_loop_tracker = lambda prompt: None
         loop._restore_agent_think = lambda: None
@@ -1119,7 +1140,7 @@ class TestAgentLoopCurrentRequestMultimodal:
         loop.sessions.save = MagicMock()
         loop._auto_commit = False
         loop._git = None
-        loop._prepare_request_context = AsyncMock(return_value=None)
+        loop._prepare_request_context = _skip_request_context
         loop._build_step_prompt = lambda message: f"prompt::{message}"
         loop._install_anti_loop_tracker = lambda prompt: None
         loop._restore_agent_think = lambda: None
@@ -1171,7 +1192,7 @@ class TestAgentLoopCurrentRequestMultimodal:
         loop.sessions.save = MagicMock()
         loop._auto_commit = False
         loop._git = None
-        loop._prepare_request_context = AsyncMock(return_value=None)
+        loop._prepare_request_context = _skip_request_context
         loop._build_step_prompt = lambda message: f"prompt::{message}"
         loop._install_anti_loop_tracker = lambda prompt: None
         loop._restore_agent_think = lambda: None
@@ -1229,7 +1250,7 @@ class TestAgentLoopCurrentRequestMultimodal:
         loop.sessions.save = MagicMock()
         loop._auto_commit = False
         loop._git = None
-        loop._prepare_request_context = AsyncMock(return_value=None)
+        loop._prepare_request_context = _skip_request_context
         loop._build_step_prompt = lambda message: f"prompt::{message}"
         loop._install_anti_loop_tracker = lambda prompt: None
         loop._restore_agent_think = lambda: None
@@ -1257,19 +1278,11 @@ class TestAgentLoopStreamFallback:
     async def test_stream_falls_back_to_run_result_when_no_chunks(self, tmp_dir: Path):
         from spoon_bot.agent.loop import AgentLoop
 
-        loop = AgentLoop.__new__(AgentLoop)
-        loop._initialized = True
-        loop._agent = _NoChunkRuntimeAgent("fallback from run result")
-        loop.workspace = tmp_dir
-        loop._session = Session(session_key="stream_fallback")
-        loop.sessions = MagicMock()
-        loop.sessions.save = MagicMock()
-        loop.memory = MagicMock()
-        loop.memory.get_memory_context = MagicMock(return_value=None)
-        loop.context = MagicMock()
-        loop._prepare_request_context = AsyncMock(return_value=None)
-        loop._build_step_prompt = lambda message: f"prompt::{message}"
-        loop._install_anti_loop_tracker = lambda prompt: None
+        loop = _build_stream_test_loop(
+            tmp_dir,
+            agent=_NoChunkRuntimeAgent("fallback from run result"),
+            session_key="stream_fallback",
+        )
 
         chunks = []
         async for chunk in AgentLoop.stream(loop, message="hello"):
@@ -1293,19 +1306,11 @@ class TestAgentLoopStreamFallback:
     async def test_stream_preserves_incremental_queue_chunks(self, tmp_dir: Path):
         from spoon_bot.agent.loop import AgentLoop
 
-        loop = AgentLoop.__new__(AgentLoop)
-        loop._initialized = True
-        loop._agent = _ChunkedRuntimeAgent(["Hel", "lo"])
-        loop.workspace = tmp_dir
-        loop._session = Session(session_key="stream_incremental")
-        loop.sessions = MagicMock()
-        loop.sessions.save = MagicMock()
-        loop.memory = MagicMock()
-        loop.memory.get_memory_context = MagicMock(return_value=None)
-        loop.context = MagicMock()
-        loop._prepare_request_context = AsyncMock(return_value=None)
-        loop._build_step_prompt = lambda message: f"prompt::{message}"
-        loop._install_anti_loop_tracker = lambda prompt: None
+        loop = _build_stream_test_loop(
+            tmp_dir,
+            agent=_ChunkedRuntimeAgent(["Hel", "lo"]),
+            session_key="stream_incremental",
+        )
 
         chunks = []
         async for chunk in AgentLoop.stream(loop, message="hello"):
@@ -1325,19 +1330,11 @@ class TestAgentLoopStreamFallback:
         from spoon_bot.agent.loop import AgentLoop
 
         answer_chunks = ["Final answer ", "visible over websocket."]
-        loop = AgentLoop.__new__(AgentLoop)
-        loop._initialized = True
-        loop._agent = _ToolThenChunkedRuntimeAgent(answer_chunks)
-        loop.workspace = tmp_dir
-        loop._session = Session(session_key="stream_post_tool_content")
-        loop.sessions = MagicMock()
-        loop.sessions.save = MagicMock()
-        loop.memory = MagicMock()
-        loop.memory.get_memory_context = MagicMock(return_value=None)
-        loop.context = MagicMock()
-        loop._prepare_request_context = AsyncMock(return_value=None)
-        loop._build_step_prompt = lambda message: f"prompt::{message}"
-        loop._install_anti_loop_tracker = lambda prompt: None
+        loop = _build_stream_test_loop(
+            tmp_dir,
+            agent=_ToolThenChunkedRuntimeAgent(answer_chunks),
+            session_key="stream_post_tool_content",
+        )
         loop._evaluate_task_completion_verdict = AsyncMock(
             return_value={"status": "complete", "reason": "", "next_focus": ""}
         )
@@ -1367,19 +1364,11 @@ class TestAgentLoopStreamFallback:
             "Status is healthy; continuing task.",
             "No follow-up action is currently available.",
         ]
-        loop = AgentLoop.__new__(AgentLoop)
-        loop._initialized = True
-        loop._agent = _InterleavedToolContentRuntimeAgent(segments)
-        loop.workspace = tmp_dir
-        loop._session = Session(session_key="stream_post_tool_final_segment")
-        loop.sessions = MagicMock()
-        loop.sessions.save = MagicMock()
-        loop.memory = MagicMock()
-        loop.memory.get_memory_context = MagicMock(return_value=None)
-        loop.context = MagicMock()
-        loop._prepare_request_context = AsyncMock(return_value=None)
-        loop._build_step_prompt = lambda message: f"prompt::{message}"
-        loop._install_anti_loop_tracker = lambda prompt: None
+        loop = _build_stream_test_loop(
+            tmp_dir,
+            agent=_InterleavedToolContentRuntimeAgent(segments),
+            session_key="stream_post_tool_final_segment",
+        )
         loop._evaluate_task_completion_verdict = AsyncMock(
             return_value={"status": "complete", "reason": "", "next_focus": ""}
         )
@@ -1408,23 +1397,16 @@ class TestAgentLoopStreamFallback:
             "前置检查完成，继续执行下一步。 "
             + final_answer
         )
-        loop = AgentLoop.__new__(AgentLoop)
-        loop._initialized = True
-        loop._agent = _InterleavedToolContentRuntimeAgent([
+        agent = _InterleavedToolContentRuntimeAgent([
             first_progress,
             second_progress,
             repeated_final_chunk,
         ])
-        loop.workspace = tmp_dir
-        loop._session = Session(session_key="stream_post_tool_repeated_final")
-        loop.sessions = MagicMock()
-        loop.sessions.save = MagicMock()
-        loop.memory = MagicMock()
-        loop.memory.get_memory_context = MagicMock(return_value=None)
-        loop.context = MagicMock()
-        loop._prepare_request_context = AsyncMock(return_value=None)
-        loop._build_step_prompt = lambda message: f"prompt::{message}"
-        loop._install_anti_loop_tracker = lambda prompt: None
+        loop = _build_stream_test_loop(
+            tmp_dir,
+            agent=agent,
+            session_key="stream_post_tool_repeated_final",
+        )
         loop._evaluate_task_completion_verdict = AsyncMock(
             return_value={"status": "complete", "reason": "", "next_focus": ""}
         )
@@ -1471,19 +1453,11 @@ class TestAgentLoopStreamFallback:
             synthesize,
         )
 
-        loop = AgentLoop.__new__(AgentLoop)
-        loop._initialized = True
-        loop._agent = _SkillSummaryThenContentRuntimeAgent(final_summary)
-        loop.workspace = tmp_dir
-        loop._session = Session(session_key="stream_terminal_skill_summary")
-        loop.sessions = MagicMock()
-        loop.sessions.save = MagicMock()
-        loop.memory = MagicMock()
-        loop.memory.get_memory_context = MagicMock(return_value=None)
-        loop.context = MagicMock()
-        loop._prepare_request_context = AsyncMock(return_value=None)
-        loop._build_step_prompt = lambda message: f"prompt::{message}"
-        loop._install_anti_loop_tracker = lambda prompt: None
+        loop = _build_stream_test_loop(
+            tmp_dir,
+            agent=_SkillSummaryThenContentRuntimeAgent(final_summary),
+            session_key="stream_terminal_skill_summary",
+        )
         loop._evaluate_task_completion_verdict = AsyncMock(
             return_value={"status": "complete", "reason": "", "next_focus": ""}
         )
@@ -1505,19 +1479,11 @@ class TestAgentLoopStreamFallback:
     async def test_stream_persists_original_user_text_instead_of_attachment_prose(self, tmp_dir: Path):
         from spoon_bot.agent.loop import AgentLoop, _ensure_attachment_context
 
-        loop = AgentLoop.__new__(AgentLoop)
-        loop._initialized = True
-        loop._agent = _NoChunkRuntimeAgent("attachment reply")
-        loop.workspace = tmp_dir
-        loop._session = Session(session_key="stream_attachment_text")
-        loop.sessions = MagicMock()
-        loop.sessions.save = MagicMock()
-        loop.memory = MagicMock()
-        loop.memory.get_memory_context = MagicMock(return_value=None)
-        loop.context = MagicMock()
-        loop._prepare_request_context = AsyncMock(return_value=None)
-        loop._build_step_prompt = lambda message: f"prompt::{message}"
-        loop._install_anti_loop_tracker = lambda prompt: None
+        loop = _build_stream_test_loop(
+            tmp_dir,
+            agent=_NoChunkRuntimeAgent("attachment reply"),
+            session_key="stream_attachment_text",
+        )
 
         attachments = [{"uri": "/workspace/uploads/demo.pdf", "name": "demo.pdf"}]
         injected_message = _ensure_attachment_context("Please summarize the attachment.", attachments)
@@ -1535,19 +1501,11 @@ class TestAgentLoopStreamFallback:
     async def test_stream_persists_user_turn_when_upstream_fails(self, tmp_dir: Path):
         from spoon_bot.agent.loop import AgentLoop
 
-        loop = AgentLoop.__new__(AgentLoop)
-        loop._initialized = True
-        loop._agent = _FailingStreamRuntimeAgent("unused")
-        loop.workspace = tmp_dir
-        loop._session = Session(session_key="stream_error_context")
-        loop.sessions = MagicMock()
-        loop.sessions.save = MagicMock()
-        loop.memory = MagicMock()
-        loop.memory.get_memory_context = MagicMock(return_value=None)
-        loop.context = MagicMock()
-        loop._prepare_request_context = AsyncMock(return_value=None)
-        loop._build_step_prompt = lambda message: f"prompt::{message}"
-        loop._install_anti_loop_tracker = lambda prompt: None
+        loop = _build_stream_test_loop(
+            tmp_dir,
+            agent=_FailingStreamRuntimeAgent("unused"),
+            session_key="stream_error_context",
+        )
 
         chunks = []
         async for chunk in AgentLoop.stream(loop, message="keep this request in history"):
@@ -1567,19 +1525,11 @@ class TestAgentLoopStreamFallback:
     async def test_stream_failure_persists_tool_trace_for_followup_recall(self, tmp_dir: Path):
         from spoon_bot.agent.loop import AgentLoop
 
-        loop = AgentLoop.__new__(AgentLoop)
-        loop._initialized = True
-        loop._agent = _FailingToolTraceRuntimeAgent("unused")
-        loop.workspace = tmp_dir
-        loop._session = Session(session_key="stream_error_tool_context")
-        loop.sessions = MagicMock()
-        loop.sessions.save = MagicMock()
-        loop.memory = MagicMock()
-        loop.memory.get_memory_context = MagicMock(return_value=None)
-        loop.context = MagicMock()
-        loop._prepare_request_context = AsyncMock(return_value=None)
-        loop._build_step_prompt = lambda message: f"prompt::{message}"
-        loop._install_anti_loop_tracker = lambda prompt: None
+        loop = _build_stream_test_loop(
+            tmp_dir,
+            agent=_FailingToolTraceRuntimeAgent("unused"),
+            session_key="stream_error_tool_context",
+        )
 
         chunks = []
         async for chunk in AgentLoop.stream(loop, message="run the task challenge"):
@@ -1828,7 +1778,7 @@ class TestAgentLoopThinkingMode:
         loop._session = Session(session_key="thinking_mode")
         loop.sessions = MagicMock()
         loop.sessions.save = MagicMock()
-        loop._prepare_request_context = AsyncMock(return_value=None)
+        loop._prepare_request_context = _skip_request_context
         loop._build_step_prompt = lambda message: f"prompt::{message}"
         loop._install_anti_loop_tracker = lambda prompt: None
         loop._restore_agent_think = lambda: None
@@ -1878,7 +1828,7 @@ class TestAgentLoopThinkingMode:
         loop._session = Session(session_key="thinking_mode")
         loop.sessions = MagicMock()
         loop.sessions.save = MagicMock()
-        loop._prepare_request_context = AsyncMock(return_value=None)
+        loop._prepare_request_context = _skip_request_context
         loop._build_step_prompt = lambda message: f"prompt::{message}"
         loop._install_anti_loop_tracker = lambda prompt: None
         loop._restore_agent_think = lambda: None
@@ -1912,7 +1862,7 @@ class TestAgentLoopThinkingMode:
         loop._session = Session(session_key="thinking_mode")
         loop.sessions = MagicMock()
         loop.sessions.save = MagicMock()
-        loop._prepare_request_context = AsyncMock(return_value=None)
+        loop._prepare_request_context = _skip_request_context
         loop._build_step_prompt = lambda message: f"prompt::{message}"
         loop._install_anti_loop_tracker = lambda prompt: None
         loop._restore_agent_think = lambda: None
@@ -1944,7 +1894,7 @@ class TestAgentLoopThinkingMode:
         loop._session = Session(session_key="thinking_cancelled")
         loop.sessions = MagicMock()
         loop.sessions.save = MagicMock()
-        loop._prepare_request_context = AsyncMock(return_value=None)
+        loop._prepare_request_context = _skip_request_context
         loop._install_anti_loop_tracker = lambda prompt: None
         loop._restore_agent_think = lambda: None
         loop._auto_commit = False
@@ -1975,7 +1925,7 @@ class TestAgentLoopThinkingMode:
         loop._session = Session(session_key="thinking_retry")
         loop.sessions = MagicMock()
         loop.sessions.save = MagicMock()
-        loop._prepare_request_context = AsyncMock(return_value=None)
+        loop._prepare_request_context = _skip_request_context
         loop._build_step_prompt = lambda message: f"prompt::{message}"
         loop._install_anti_loop_tracker = lambda prompt: None
         loop._restore_agent_think = lambda: None
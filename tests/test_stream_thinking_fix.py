@@ -11,6 +11,7 @@ Covers:
 from __future__ import annotations
 
 import asyncio
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -22,26 +23,24 @@ def _make_mock_stream_agent(run_impl) -> tuple[object, asyncio.Queue, asyncio.Ev
     oq: asyncio.Queue = asyncio.Queue()
     td = asyncio.Event()
 
-    agent = MagicMock(spec=AgentLoop)
+    agent = AgentLoop.__new__(AgentLoop)
     agent._initialized = True
-    agent._agent = MagicMock()
-    agent._agent.output_queue = oq
-    agent._agent.task_done = td
-    agent._agent.run = run_impl
-    agent._agent.state = "idle"
-    agent._agent.add_message = AsyncMock()
-    agent._session = MagicMock()
-    agent._session.add_message = MagicMock()
-    agent.sessions = MagicMock()
-    agent.sessions.save = MagicMock()
-    agent.memory = MagicMock()
-    agent.memory.get_memory_context = MagicMock(return_value=None)
-    agent.context = MagicMock()
+    agent._agent = SimpleNamespace(
+        output_queue=oq,
+        task_done=td,
+        run=run_impl,
+        state="idle",
+        add_message=AsyncMock(),
+    )
+    agent._session = SimpleNamespace(add_message=lambda *args, **kwargs: None)
+    agent.sessions = SimpleNamespace(save=lambda *args, **kwargs: None)
+    agent.memory = SimpleNamespace(get_memory_context=lambda *args, **kwargs: None)
+    agent.context = None
     agent._prepare_request_context = AsyncMock()
-    agent._build_runtime_message_content = MagicMock(return_value="test")
-    agent._build_step_prompt = MagicMock(return_value="prompt")
-    agent._install_anti_loop_tracker = MagicMock()
-    agent._restore_agent_think = MagicMock()
+    agent._build_runtime_message_content = lambda *args, **kwargs: "test"
+    agent._build_step_prompt = lambda *args, **kwargs: "prompt"
+    agent._install_anti_loop_tracker = lambda *args, **kwargs: None
+    agent._restore_agent_think = lambda *args, **kwargs: None
 
     async def _run_with_retry_stub(**kwargs):
         return await run_impl(**kwargs)
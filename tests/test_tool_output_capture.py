@@ -4,6 +4,9 @@ from pathlib import Path
 
 import pytest
 
+# Longer than the tool's max_output so the result takes the truncation path.
+_LONG_TEXT = "A" * 120
+
 
 @pytest.mark.asyncio
 async def test_read_file_tool_records_full_output_for_stream_capture(tmp_path: Path):
@@ -16,7 +19,7 @@ async def test_read_file_tool_records_full_output_for_stream_capture(tmp_path: P
     from spoon_bot.agent.tools.filesystem import ReadFileTool
 
     file_path = tmp_path / "long.txt"
-    file_path.write_text("A" * 120, encoding="utf-8")
+    file_path.write_text(_LONG_TEXT, encoding="utf-8")
 
     tool = ReadFileTool(workspace=tmp_path, max_output=40)
 
@@ -35,7 +38,7 @@ async def test_read_file_tool_records_full_output_for_stream_capture(tmp_path: P
     assert "... (truncated," in result
     assert "... (truncated," in captured.summary_output
     assert "... (truncated," not in captured.full_output
-    assert "A" * 120 in captured.full_output
+    assert _LONG_TEXT in captured.full_output
 
 
 @pytest.mark.asyncio
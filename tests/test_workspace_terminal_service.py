@@ -4,7 +4,6 @@ import asyncio
 import os
 import signal
 import subprocess
-import tempfile
 from pathlib import Path
 
 import pytest
@@ -20,133 +19,130 @@ def _test_shell() -> tuple[str, str]:
 
 
 @pytest.mark.asyncio
-async def test_workspace_terminal_service_open_input_and_close() -> None:
-    with tempfile.TemporaryDirectory() as temp_dir:
-        workspace = Path(temp_dir) / "workspace"
-        workspace.mkdir()
+async def test_workspace_terminal_service_open_input_and_close(tmp_path: Path) -> None:
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
 
-        stdout_events: list[dict[str, object]] = []
-        closed_events: list[dict[str, object]] = []
+    stdout_events: list[dict[str, object]] = []
+    closed_events: list[dict[str, object]] = []
 
-        async def emit_stdout(payload: dict[str, object]) -> None:
-            stdout_events.append(payload)
+    async def emit_stdout(payload: dict[str, object]) -> None:
+        stdout_events.append(payload)
 
-        async def emit_closed(payload: dict[str, object]) -> None:
-            closed_events.append(payload)
+    async def emit_closed(payload: dict[str, object]) -> None:
+        closed_events.append(payload)
 
-        service = WorkspaceTerminalService(
-            workspace,
-            emit_stdout=emit_stdout,
-            emit_closed=emit_closed,
-            sandbox_id="sbx_test",
-        )
+    service = WorkspaceTerminalService(
+        workspace,
+        emit_stdout=emit_stdout,
+        emit_closed=emit_closed,
+        sandbox_id="sbx_test",
+    )
 
-        shell, command = _test_shell()
-        opened = await service.open(cwd="/workspace", shell=shell, cols=80, rows=24)
-        term_id = opened["term_id"]
+    shell, command = _test_shell()
+    opened = await service.open(cwd="/workspace", shell=shell, cols=80, rows=24)
+    term_id = opened["term_id"]
 
-        await service.input(term_id, command)
+    await service.input(term_id, command)
 
-        for _ in range(60):
-            if closed_events:
-                break
-            await asyncio.sleep(0.1)
+    for _ in range(60):
+        if closed_events:
+            break
+        await asyncio.sleep(0.1)
 
-        await service.shutdown()
+    await service.shutdown()
 
-        assert any("hello" in str(event.get("chunk", "")).lower() for event in stdout_events)
-        assert any(event.get("term_id") == term_id for event in closed_events)
-        assert all(event.get("sandbox_id") == "sbx_test" for event in stdout_events)
+    assert any("hello" in str(event.get("chunk", "")).lower() for event in stdout_events)
+    assert any(event.get("term_id") == term_id for event in closed_events)
+    assert all(event.get("sandbox_id") == "sbx_test" for event in stdout_events)
 
 
 @pytest.mark.asyncio
-async def test_workspace_terminal_service_resize_and_manual_close() -> None:
-    with tempfile.TemporaryDirectory() as temp_dir:
-        workspace = Path(temp_dir) / "workspace"
-        workspace.mkdir()
+async def test_workspace_terminal_service_resize_and_manual_close(tmp_path: Path) -> None:
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
 
-        closed_events: list[dict[str, object]] = []
+    closed_events: list[dict[str, object]] = []
 
-        async def emit_stdout(payload: dict[str, object]) -> None:
-            return None
+    async def emit_stdout(payload: dict[str, object]) -> None:
+        return None
 
-        async def emit_closed(payload: dict[str, object]) -> None:
-            closed_events.append(payload)
+    async def emit_closed(payload: dict[str, object]) -> None:
+        closed_events.append(payload)
 
-        service = WorkspaceTerminalService(
-            workspace,
-            emit_stdout=emit_stdout,
-            emit_closed=emit_closed,
-        )
+    service = WorkspaceTerminalService(
+        workspace,
+        emit_stdout=emit_stdout,
+        emit_closed=emit_closed,
+    )
 
-        shell, _ = _test_shell()
-        opened = await service.open(shell=shell)
-        term_id = opened["term_id"]
+    shell, _ = _test_shell()
+    opened = await service.open(shell=shell)
+    term_id = opened["term_id"]
 
-        resized = await service.resize(term_id, cols=100, rows=40)
-        assert resized == {"resized": True}
+    resized = await service.resize(term_id, cols=100, rows=40)
+    assert resized == {"resized": True}
 
-        closed = await service.close(term_id)
-        assert closed == {"closed": True}
+    closed = await service.close(term_id)
+    assert closed == {"closed": True}
 
-        for _ in range(40):
-            if closed_events:
-                break
-            await asyncio.sleep(0.1)
+    for _ in range(40):
+        if closed_events:
+            break
+        await asyncio.sleep(0.1)
 
-        assert any(event.get("term_id") == term_id for event in closed_events)
-        assert any(event.get("reason") == "user_closed" for event in closed_events)
+    assert any(event.get("term_id") == term_id for event in closed_events)
+    assert any(event.get("reason") == "user_closed" for event in closed_events)
 
 
 @pytest.mark.asyncio
-async def test_workspace_terminal_service_rejects_cwd_outside_workspace() -> None:
-    with tempfile.TemporaryDirectory() as temp_dir:
-        workspace = Path(temp_dir) / "workspace"
-        workspace.mkdir()
-
-        async def emit_stdout(payload: dict[str, object]) -> None:
-            return None
-
-        async def emit_closed(payload: dict[str, object]) -> None:
-            return None
-
-        service = WorkspaceTerminalService(
-            workspace,
-            emit_stdout=emit_stdout,
-            emit_closed=emit_closed,
-        )
-
-        shell, _ = _test_shell()
-        with pytest.raises(ValueError, match="outside workspace boundary"):
-            await service.open(cwd="/etc", shell=shell)
-
-
-def test_workspace_terminal_service_preserves_logical_workspace_path_for_symlink_root() -> None:
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
-        real_workspace = temp_path / "real-workspace"
-        real_workspace.mkdir()
-        linked_workspace = temp_path / "workspace"
-        linked_workspace.symlink_to(real_workspace, target_is_directory=True)
-
-        async def emit_stdout(payload: dict[str, object]) -> None:
-            return None
-
-        async def emit_closed(payload: dict[str, object]) -> None:
-            return None
-
-        service = WorkspaceTerminalService(
-            linked_workspace,
-            emit_stdout=emit_stdout,
-            emit_closed=emit_closed,
-        )
-
-        resolved = service._resolve_workspace_path("/workspace")
-        assert resolved == linked_workspace.absolute()
-        assert resolved != real_workspace.resolve()
-
-        real_path_resolved = service._resolve_workspace_path(real_workspace.as_posix())
-        assert real_path_resolved == linked_workspace.absolute()
+async def test_workspace_terminal_service_rejects_cwd_outside_workspace(tmp_path: Path) -> None:
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+
+    async def emit_stdout(payload: dict[str, object]) -> None:
+        return None
+
+    async def emit_closed(payload: dict[str, object]) -> None:
+        return None
+
+    service = WorkspaceTerminalService(
+        workspace,
+        emit_stdout=emit_stdout,
+        emit_closed=emit_closed,
+    )
+
+    shell, _ = _test_shell()
+    with pytest.raises(ValueError, match="outside workspace boundary"):
+        await service.open(cwd="/etc", shell=shell)
+
+
+def test_workspace_terminal_service_preserves_logical_workspace_path_for_symlink_root(
+    tmp_path: Path,
+) -> None:
+    real_workspace = tmp_path / "real-workspace"
+    real_workspace.mkdir()
+    linked_workspace = tmp_path / "workspace"
+    linked_workspace.symlink_to(real_workspace, target_is_directory=True)
+
+    async def emit_stdout(payload: dict[str, object]) -> None:
+        return None
+
+    async def emit_closed(payload: dict[str, object]) -> None:
+        return None
+
+    service = WorkspaceTerminalService(
+        linked_workspace,
+        emit_stdout=emit_stdout,
+        emit_closed=emit_closed,
+    )
+
+    resolved = service._resolve_workspace_path("/workspace")
+    assert resolved == linked_workspace.absolute()
+    assert resolved != real_workspace.resolve()
+
+    real_path_resolved = service._resolve_workspace_path(real_workspace.as_posix())
+    assert real_path_resolved == linked_workspace.absolute()
 
 
 def test_workspace_terminal_service_terminates_process_group_on_posix(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -14,7 +14,9 @@ from pathlib import Path
 
 import pytest
 
+from spoon_bot.agent.context import ContextBuilder
 from spoon_bot.config import AgentLoopConfig, validate_agent_loop_params
+from spoon_bot.gateway.websocket.workspace_fs import WorkspaceFSService
 
 
 class TestYoloConfig:
@@ -49,16 +51,12 @@ class TestYoloWorkspaceFS:
     """Test WorkspaceFSService in YOLO mode."""
 
     def test_yolo_resolve_relative_path(self, tmp_path):
-        from spoon_bot.gateway.websocket.workspace_fs import WorkspaceFSService
-
         (tmp_path / "hello.txt").write_text("world")
         svc = WorkspaceFSService(workspace_root=tmp_path, yolo_mode=True)
         result_sync = svc._stat_sync("hello.txt")
         assert result_sync["type"] == "file"
 
     def test_yolo_resolve_absolute_within_workspace(self, tmp_path):
-        from spoon_bot.gateway.websocket.workspace_fs import WorkspaceFSService
-
         sub = tmp_path / "sub"
         sub.mkdir()
         (sub / "data.txt").write_text("content")
@@ -68,15 +66,11 @@ class TestYoloWorkspaceFS:
         assert result["type"] == "file"
 
     def test_yolo_rejects_path_outside_workspace(self, tmp_path):
-        from spoon_bot.gateway.websocket.workspace_fs import WorkspaceFSService
-
         svc = WorkspaceFSService(workspace_root=tmp_path, yolo_mode=True)
         with pytest.raises(ValueError, match="outside workspace"):
             svc._stat_sync("/etc/passwd")
 
     def test_yolo_read_file(self, tmp_path):
-        from spoon_bot.gateway.websocket.workspace_fs import WorkspaceFSService
-
         test_file = tmp_path / "test.txt"
         test_file.write_text("YOLO content!")
         svc = WorkspaceFSService(workspace_root=tmp_path, yolo_mode=True)
@@ -84,8 +78,6 @@ class TestYoloWorkspaceFS:
         assert result["content"] == "YOLO content!"
 
     def test_yolo_write_file(self, tmp_path):
-        from spoon_bot.gateway.websocket.workspace_fs import WorkspaceFSService
-
         svc = WorkspaceFSService(workspace_root=tmp_path, yolo_mode=True)
         result = svc._write_sync(
             "output.txt",
@@ -97,8 +89,6 @@ class TestYoloWorkspaceFS:
         assert (tmp_path / "output.txt").read_text() == "hello from yolo"
 
     def test_non_yolo_sandbox_prefix_still_works(self, tmp_path):
-        from spoon_bot.gateway.websocket.workspace_fs import WorkspaceFSService
-
         (tmp_path / "a.txt").write_text("data")
         svc = WorkspaceFSService(workspace_root=tmp_path, yolo_mode=False)
         result = svc._stat_sync("/workspace/a.txt")
@@ -109,22 +99,16 @@ class TestYoloContextBuilder:
     """Test ContextBuilder YOLO mode banner."""
 
     def test_yolo_banner_present(self, tmp_path):
-        from spoon_bot.agent.context import ContextBuilder
-
         ctx = ContextBuilder(tmp_path, yolo_mode=True)
         prompt = ctx.build_system_prompt()
         assert "YOLO MODE ACTIVE" in prompt
 
     def test_no_yolo_banner_by_default(self, tmp_path):
-        from spoon_bot.agent.context import ContextBuilder
-
         ctx = ContextBuilder(tmp_path, yolo_mode=False)
         prompt = ctx.build_system_prompt()
         assert "YOLO MODE ACTIVE" not in prompt
 
     def test_system_prompt_includes_current_datetime_context(self, tmp_path):
-        from spoon_bot.agent.context import ContextBuilder
-
         ctx = ContextBuilder(tmp_path)
         prompt = ctx.build_system_prompt()
 
@@ -136,8 +120,6 @@ class TestYoloContextBuilder:
         assert "Temporal grounding:" in prompt
 
     def test_system_prompt_includes_safe_stop_for_unsupported_irreversible_actions(self, tmp_path):
-        from spoon_bot.agent.context import ContextBuilder
-
         ctx = ContextBuilder(tmp_path)
         prompt = ctx.build_system_prompt()
 